@@ -0,0 +1,106 @@
+# 엑셀 행 쓰기 마이크로 벤치마크: iterrows + write_row (기존) vs 열 단위 일괄 쓰기
+#   python benchmarks/bench_excel_write.py [--rows 10000 100000] [--repeat 3]
+import argparse
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app_module():
+    # test.py 는 표준 라이브러리 test 패키지와 이름이 겹쳐서 경로로 직접 로드
+    spec = importlib.util.spec_from_file_location("zxc_app", os.path.join(ROOT, "test.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module._ensure_heavy_imports()
+    return module
+
+
+def make_frame(rows, seed=0):
+    # 웨이브 테이블과 비슷한 14열 (문자 라벨 + 정수 + 실수), dropna 후처럼 인덱스에 구멍이 있음
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "센터": rng.choice(["INC1", "INC2", "INC3", "INC4"], rows),
+        "캠프": rng.choice([f"CAMP{i:02d}" for i in range(40)], rows),
+        "단위": rng.choice(["Parcel", "Pallet"], rows),
+        "ExSD": rng.choice([f"2025-11-30 {h:02d}:00:05 (WAVE{h})" for h in range(24)], rows),
+    })
+    for i in range(6):
+        df[f"수량{i}"] = rng.integers(0, 5000, rows)
+    for i in range(4):
+        df[f"비율{i}"] = rng.random(rows) * 100
+    return df.iloc[::1].set_axis(np.arange(rows) * 2)
+
+
+def legacy_write(ws, start_row, df, fmt):
+    for idx, row in df.reset_index(drop=True).iterrows():
+        ws.write_row(start_row + idx, 0, row.tolist(), fmt)
+
+
+def time_it(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_xlsxwriter(app, df, repeat):
+    def run(writer_fn):
+        def _run():
+            wb = xlsxwriter.Workbook(io.BytesIO(), {"in_memory": True})
+            ws = wb.add_worksheet("테스트")
+            writer_fn(ws, 33, df, wb.add_format({"align": "center"}))
+        return _run
+    return time_it(run(legacy_write), repeat), time_it(run(app._write_frame_xlsxwriter), repeat)
+
+
+def bench_appender(app, df, repeat, folder):
+    path = os.path.join(folder, "base.xlsx")
+    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
+        pd.DataFrame([[1]]).to_excel(writer, sheet_name="테스트", header=False, index=False)
+
+    def legacy_rows():
+        appender = app._XlsxAppender(path)
+        rows = [[app._cell_xml(f"{app._col_letter(c)}{r + 34}", v, None) for c, v in enumerate(vals)]
+                for r, vals in enumerate(df.itertuples(index=False, name=None))]
+        appender.close()
+        return rows
+
+    def block_rows():
+        appender = app._XlsxAppender(path)
+        appender.write_frame("테스트", 33, df)
+        appender.close()
+
+    return time_it(legacy_rows, repeat), time_it(block_rows, repeat)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="엑셀 행 쓰기 마이크로 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    app = load_app_module()
+    print(f"{'rows':>8} | {'path':<11} | {'legacy(s)':>9} | {'block(s)':>9} | {'speedup':>7}")
+    print("-" * 56)
+    with tempfile.TemporaryDirectory() as folder:
+        for rows in args.rows:
+            df = make_frame(rows)
+            for label, (old, new) in (("xlsxwriter", bench_xlsxwriter(app, df, args.repeat)),
+                                      ("xml-append", bench_appender(app, df, args.repeat, folder))):
+                print(f"{rows:>8} | {label:<11} | {old:>9.3f} | {new:>9.3f} | {old / new:>6.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
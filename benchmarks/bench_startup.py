@@ -0,0 +1,59 @@
+# 시작 시간 측정: 프로세스 실행 ~ 창 표시(startup_ms) / 프로세스 종료까지(wall)
+#   python benchmarks/bench_startup.py                      # python test.py
+#   python benchmarks/bench_startup.py --exe dist/추출기/추출기.exe --repeat 5
+# 결과는 JSON 한 줄씩 출력 (릴리스 간 비교용)
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_last_record(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+        return json.loads(lines[-1]) if lines else None
+    except OSError:
+        return None
+
+
+def run_once(cmd, cwd):
+    # --measure-startup: 창이 처음 그려지면 startup_times.jsonl 에 기록하고 바로 종료
+    t0 = time.perf_counter()
+    subprocess.run(cmd + ["--measure-startup"], cwd=cwd, check=True, timeout=120,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wall_ms = (time.perf_counter() - t0) * 1000
+    record = read_last_record(os.path.join(cwd, "startup_times.jsonl")) or {}
+    return wall_ms, record.get("startup_ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시작 시간 측정")
+    parser.add_argument("--exe", help="빌드된 실행 파일 (없으면 python test.py)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    cmd = [os.path.abspath(args.exe)] if args.exe else [sys.executable, os.path.join(ROOT, "test.py")]
+    cwd = os.path.dirname(cmd[0]) if args.exe else ROOT
+    walls, startups = [], []
+    for _ in range(args.repeat):
+        wall_ms, startup_ms = run_once(cmd, cwd)
+        walls.append(wall_ms)
+        if startup_ms is not None: startups.append(startup_ms)
+    result = {
+        "target": args.exe or "test.py",
+        "repeat": args.repeat,
+        "wall_ms_median": round(statistics.median(walls), 1),
+        "startup_ms_median": round(statistics.median(startups), 1) if startups else None,
+    }
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
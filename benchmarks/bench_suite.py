@@ -0,0 +1,226 @@
+# 오프라인 벤치마크 묶음: 페이지 설정 / 테이블 추출 / 엑셀 저장을 크기별로 측정하고 커밋별로 비교
+#   python benchmarks/bench_suite.py                          (가짜 드라이버, 결과는 benchmarks/results.jsonl 에 추가)
+#   python benchmarks/bench_suite.py --driver chrome          (복제본을 로컬 HTTP 로 띄우고 헤드리스 크롬으로 측정)
+#   python benchmarks/bench_suite.py --only export --rows 1000 50000
+#   python benchmarks/bench_suite.py --compare <이전 커밋> [<비교 커밋>]
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from bench_excel_write import ROOT, load_app_module, make_frame
+from fake_driver import FakeDriver
+from replica import Site, serve
+
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results.jsonl")
+EXTRACT_MODES = ("capture", "target", "full")
+
+
+def git_revision():
+    def git(*args):
+        try: return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, timeout=10).stdout.strip()
+        except (OSError, subprocess.SubprocessError): return ""
+    return git("rev-parse", "--short", "HEAD") or "unknown", bool(git("status", "--porcelain", "--untracked-files=no"))
+
+
+def make_app(app_mod, folder, url, **settings):
+    # 임시 설정 파일로 헤드리스 러너 생성 (로그/엑셀/실행 기록 모두 임시 폴더에). settings 는 추가 설정 키
+    settings_path = os.path.join(folder, "setting.txt")
+    with open(settings_path, "w", encoding="utf-8") as f:
+        f.write(f"target_url={url}\nexcel_path={os.path.join(folder, 'bench.xlsx')}\n"
+                f"log_path={os.path.join(folder, 'bench.log')}\nlocator_cache_path={os.path.join(folder, 'locators.json')}\nprimary_start_row=34\nsecondary_start_row=60\n")
+        f.write("".join(f"{key}={value}\n" for key, value in settings.items()))
+    app = app_mod.HeadlessRunner(settings_path)
+    app.update_log = lambda message, level="INFO": None
+    return app
+
+
+def measure(app, fn, repeat, setup=None):
+    # setup 은 측정 밖에서 매번 실행. 시간 + 마지막 회차 왕복 수
+    times, round_trips = [], 0
+    for _ in range(repeat):
+        if setup: setup()
+        with app.recorder.step("bench") as record:
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+        round_trips = record["round_trips"]
+    return {"median_sec": round(statistics.median(times), 4), "min_sec": round(min(times), 4), "round_trips": round_trips}
+
+
+class FakeBackend:
+    name = "fake"
+
+    def __init__(self, app_mod, app, args):
+        self.app_mod = app_mod
+        self.latency = args.latency_ms / 1000
+
+    def attach(self, app, site):
+        app.driver = self.app_mod._instrument_driver(FakeDriver(self.app_mod, site, self.latency), app.recorder)
+        return lambda: None
+
+    def close(self):
+        pass
+
+
+class ChromeBackend:
+    # 복제본을 로컬 HTTP 서버로 띄우고 헤드리스 크롬 한 개를 재사용
+    name = "chrome"
+
+    def __init__(self, app_mod, app, args):
+        self.folder = tempfile.mkdtemp(prefix="zxc_replica_")
+        self.server, self.url = serve(self.folder)
+        options = app_mod.Options()
+        for arg in ("--headless=new", "--no-sandbox", "--disable-dev-shm-usage"):
+            options.add_argument(arg)
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        self.driver = app_mod.webdriver.Chrome(options=options)
+        app_mod._instrument_driver(self.driver, app.recorder)
+
+    def attach(self, app, site):
+        # 사이트 파일을 다시 쓰고 측정 전마다 새로고침 (로드 시간은 측정 밖)
+        site.write(self.folder, static_rows=False)
+        app.driver = self.driver
+        return lambda: self.driver.get(self.url)
+
+    def close(self):
+        try: self.driver.quit()
+        except Exception: pass
+        self.server.shutdown()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+
+def bench_configure(app, backend, args):
+    for options in args.options:
+        site = Site(options=options, rows=50, latency_ms=args.page_latency_ms)
+        reload = backend.attach(app, site)
+        yield {"options": options, "page_latency_ms": args.page_latency_ms}, measure(app, app._configure_page_settings, args.repeat, reload)
+
+
+def bench_extract(app, backend, args):
+    for rows in args.rows:
+        site = Site(rows=rows, latency_ms=args.page_latency_ms)
+        reload = backend.attach(app, site)
+        for mode in EXTRACT_MODES:
+            if mode == "capture" and backend.name == "chrome": continue  # 크롬은 검색이 실제로 일어나야 응답이 잡힘
+            app.capture_url = r"data\.json" if mode == "capture" else ""
+            app.capture_json_path = "data.list"
+            app.extract_mode = "full" if mode == "full" else "target"
+            app.table_target = {"id": "resultTable" if mode != "full" else "", "xpath": "", "headers": [], "columns": 0}
+            result = measure(app, app._collect_tables, args.repeat, reload)
+            result["tables"] = len(app.all_tables)
+            yield {"mode": mode, "rows": rows}, result
+        app.capture_url = ""
+
+
+def write_workbook(path, rows, with_secondary=True):
+    # 기존 워크북 흉내: 기본 시트(상단 32행 요약 + 누적 데이터), 보조 시트, 건드리면 안 되는 다른 시트
+    df = make_frame(rows, seed=1).reset_index(drop=True)
+    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
+        df.to_excel(writer, sheet_name="테스트", header=False, index=False)
+        if with_secondary: df.head(92).to_excel(writer, sheet_name="테스트2", header=False, index=False)
+        pd.DataFrame({"메모": [f"note {i}" for i in range(50)]}).to_excel(writer, sheet_name="기타", index=False)
+
+
+def bench_export(app, backend, args, folder):
+    df_new = make_frame(args.new_rows, seed=2)
+    for rows in args.rows:
+        for layout, with_secondary in (("append", True), ("rewrite", False)):
+            base = os.path.join(folder, f"base_{rows}_{layout}.xlsx")
+            target = os.path.join(folder, "bench.xlsx")
+            write_workbook(base, rows, with_secondary)
+            setup = lambda: shutil.copyfile(base, target)
+            result = measure(app, lambda: app._write_to_excel_file(target, df_new), args.repeat, setup)
+            result["size_kb"] = os.path.getsize(target) // 1024
+            yield {"layout": layout, "existing_rows": rows, "new_rows": args.new_rows}, result
+
+
+def run(args):
+    app_mod = load_app_module()
+    commit, dirty = git_revision()
+    records = []
+    with tempfile.TemporaryDirectory() as folder:
+        app = make_app(app_mod, folder, "http://127.0.0.1/index.html")
+        backend = (ChromeBackend if args.driver == "chrome" else FakeBackend)(app_mod, app, args)
+        try:
+            suites = {
+                "configure": lambda: bench_configure(app, backend, args),
+                "extract": lambda: bench_extract(app, backend, args),
+                "export": lambda: bench_export(app, backend, args, folder),
+            }
+            print(f"{'bench':<10} | {'params':<52} | {'median(s)':>9} | {'min(s)':>8} | {'trips':>6}")
+            print("-" * 98)
+            for name in args.only or suites:
+                for params, result in suites[name]():
+                    params = {"driver": backend.name, **params}
+                    shown = " ".join(f"{k}={v}" for k, v in params.items())
+                    print(f"{name:<10} | {shown:<52} | {result['median_sec']:>9.4f} | {result['min_sec']:>8.4f} | {result['round_trips']:>6}")
+                    records.append({"commit": commit, "dirty": dirty, "time": datetime.now().isoformat(timespec="seconds"),
+                                    "bench": name, "params": params, "repeat": args.repeat, **result})
+        finally:
+            backend.close()
+            if app._log_listener: app._log_listener.stop()
+    if args.out:
+        with open(args.out, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"\n{len(records)}건 기록 -> {args.out} (커밋 {commit}{' +변경' if dirty else ''})")
+    return 0
+
+
+def _key(record):
+    return record["bench"], json.dumps(record["params"], sort_keys=True, ensure_ascii=False)
+
+
+def compare(path, base, head=None):
+    # 같은 (bench, params) 끼리 두 커밋의 중앙값 비교. 같은 커밋이 여러 번이면 마지막 기록 사용
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    head = head or git_revision()[0]
+    picked = {base: {}, head: {}}
+    for record in records:
+        for rev in picked:
+            if record["commit"].startswith(rev) or rev.startswith(record["commit"]):
+                picked[rev][_key(record)] = record
+    if not picked[base] or not picked[head]:
+        missing = [rev for rev, found in picked.items() if not found]
+        print(f"기록 없음: {', '.join(missing)} ({path})")
+        return 1
+    print(f"{'bench':<10} | {'params':<52} | {base[:9]:>9} | {head[:9]:>9} | {'ratio':>6} | {'trips':>11}")
+    print("-" * 112)
+    for key in sorted(set(picked[base]) & set(picked[head])):
+        old, new = picked[base][key], picked[head][key]
+        shown = " ".join(f"{k}={v}" for k, v in json.loads(key[1]).items())
+        ratio = old["median_sec"] / new["median_sec"] if new["median_sec"] else float("inf")
+        trips = f"{old['round_trips']}->{new['round_trips']}"
+        print(f"{key[0]:<10} | {shown:<52} | {old['median_sec']:>9.4f} | {new['median_sec']:>9.4f} | {ratio:>5.2f}x | {trips:>11}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 벤치마크 (설정/추출/저장)")
+    parser.add_argument("--driver", choices=("fake", "chrome"), default="fake")
+    parser.add_argument("--only", nargs="+", choices=("configure", "extract", "export"))
+    parser.add_argument("--options", type=int, nargs="+", default=[24, 200], help="드랍다운 옵션 개수")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 50_000], help="테이블/기존 시트 행 수")
+    parser.add_argument("--new-rows", type=int, default=1_000, help="엑셀에 추가할 행 수")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="가짜 드라이버 명령당 왕복 지연")
+    parser.add_argument("--page-latency-ms", type=int, default=50, help="드랍다운/검색 화면 지연")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default=RESULTS_PATH, help="결과 JSONL (빈 값이면 기록 안 함)")
+    parser.add_argument("--compare", nargs="+", metavar="COMMIT", help="기록된 두 커밋 비교 (하나만 주면 현재 HEAD 와)")
+    args = parser.parse_args(argv)
+    if args.compare: return compare(args.out or RESULTS_PATH, *args.compare[:2])
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
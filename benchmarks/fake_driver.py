@@ -0,0 +1,131 @@
+# 크롬 없이 설정/추출 경로를 돌리는 가짜 WebDriver
+# - 모든 명령이 execute() 를 지나므로 test.py 의 _instrument_driver 로 왕복 수가 그대로 집계됨
+# - 명령마다 latency 초 (chromedriver 왕복 비용), 드랍다운을 연 뒤에는 site.latency_ms 동안 옵션이 안 보임
+# - 대기 스크립트(_WAIT_QUIET_JS)는 quiet_ms + 화면 지연만큼 잠들었다가 True
+import json
+import re
+import time
+
+_CONTAINS_RE = re.compile(r"contains\(\., '([^']*)'\)")
+
+
+def _hour_of(text):
+    for part in text.split():
+        if ":" in part:
+            try: return int(part.split(":")[0])
+            except ValueError: pass
+    return -1
+
+
+class FakeElement:
+    def __init__(self, driver, xpath):
+        self.driver = driver
+        self.xpath = xpath
+
+    @property
+    def text(self):
+        return self.xpath
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.driver.execute("elementClick")
+        self.driver.opened()
+
+
+class FakeDriver:
+    def __init__(self, app, site, latency=0.002):
+        self.app = app
+        self.site = site
+        self.latency = latency
+        self.busy_until = 0.0
+        self.commands = {}
+
+    def execute(self, driver_command, params=None):
+        self.commands[driver_command] = self.commands.get(driver_command, 0) + 1
+        if self.latency: time.sleep(self.latency)
+        return {"value": None}
+
+    def opened(self):
+        # 드랍다운 열기/옵션 클릭 후 화면이 다시 그려지는 동안은 요소를 못 찾음
+        self.busy_until = time.perf_counter() + self.site.latency_ms / 1000
+
+    def _ready(self):
+        return time.perf_counter() >= self.busy_until
+
+    def get(self, url):
+        self.execute("get")
+
+    def find_element(self, by="xpath", value=None):
+        self.execute("findElement")
+        if not self._ready(): raise self.app.NoSuchElementException(value)
+        return FakeElement(self, value)
+
+    def find_elements(self, by="xpath", value=None):
+        self.execute("findElements")
+        if not self._ready(): return []
+        return [FakeElement(self, value) for _ in range(self.site.options)]
+
+    def set_script_timeout(self, seconds):
+        self.execute("setTimeouts")
+
+    def execute_script(self, script, *args):
+        self.execute("executeScript")
+        if "click()" in script: self.opened()
+        if script is self.app._BATCH_SELECT_JS: return self._batch_select(*args)
+        if script is self.app._EXTRACT_TABLE_JS: return self.site.payloads() if (args[0] or {}).get("all") else self.site.payload()
+        if script is getattr(self.app, "_FIRST_VISIBLE_JS", None): return 0 if args[0] else -1
+        if "readyState" in script: return "complete"
+        if "localStorage" in script: return {}
+        return None
+
+    def execute_async_script(self, script, *args):
+        self.execute("executeAsyncScript")
+        if script is self.app._WAIT_QUIET_JS:
+            _, quiet_ms, timeout_ms = args
+            time.sleep(min(quiet_ms + self.site.latency_ms, timeout_ms) / 1000)
+        return True
+
+    def _batch_select(self, container_xpath, option_xpath, pred):
+        pred = pred or {}
+        if pred.get("kind") == "hour_gte":
+            pool = self.site.exsd
+        else:
+            match = _CONTAINS_RE.search(option_xpath)
+            pool = self.site.centers + self.site.units
+            pool = [x for x in pool if match.group(1) in x] if match else self.site.camps
+        labels = []
+        for text in pool:
+            kind, value = pred.get("kind"), pred.get("value")
+            if kind == "hour_gte" and _hour_of(text) < value: continue
+            if kind == "contains" and value not in text: continue
+            if kind == "equals" and text != value: continue
+            labels.append(text)
+            if pred.get("limit") and len(labels) >= pred["limit"]: break
+        if labels: self.opened()
+        return {"count": len(labels), "labels": labels, "scanned": len(pool)}
+
+    @property
+    def page_source(self):
+        self.execute("getPageSource")
+        return self.site.html(static_rows=True)
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self.execute("executeCdpCommand")
+        if cmd == "Network.getResponseBody": return {"body": self.site.json_body(), "base64Encoded": False}
+        if cmd == "Network.getAllCookies": return {"cookies": []}
+        return {}
+
+    def get_log(self, log_type):
+        # 검색 응답 1건 (Network.responseReceived) 만 있는 performance 로그
+        self.execute("getLog")
+        message = {"message": {"method": "Network.responseReceived",
+                               "params": {"requestId": "1", "response": {"url": "http://127.0.0.1/data.json"}}}}
+        return [{"message": json.dumps(message)}]
+
+    def quit(self):
+        self.execute("quit")
@@ -0,0 +1,227 @@
+# 오프라인 벤치마크용 대시보드 복제본: searchForm 드랍다운(센터/캠프/정기배송/배송유형/ExSD/단위) + 결과 테이블
+#   python benchmarks/replica.py --out replica_site            (file:// 로 열기, 테이블은 정적으로 포함)
+#   python benchmarks/replica.py --serve --options 200 --rows 5000 --latency-ms 80
+# XPath 구조는 test.py 의 dropdown_settings 와 같게 맞춰둠 (실제 크롬으로도 설정 단계를 그대로 실행 가능)
+import argparse
+import functools
+import html
+import http.server
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+
+HEADERS = ["센터", "캠프", "단위", "ExSD"] + [f"수량{i}" for i in range(6)] + [f"비율{i}" for i in range(4)]
+
+
+class Site:
+    # 복제본 한 벌의 설정 + 생성 데이터. FakeDriver 와 HTML 이 같은 값을 공유
+    def __init__(self, options=24, rows=1000, extra_tables=3, latency_ms=50, seed=0):
+        self.options = options
+        self.rows = rows
+        self.extra_tables = extra_tables
+        self.latency_ms = latency_ms
+        self.seed = seed
+        self.centers = [f"INC{i + 1}" for i in range(max(4, options))]
+        self.units = ["Parcel", "Pallet", "Bulk"]
+        self.camps = [f"CAMP{i:02d}" for i in range(options)]
+        self.exsd = [f"2025-11-30 {i * 24 // options:02d}:{(i * 7) % 60:02d}:05 (WAVE{i + 1})" for i in range(options)]
+
+    @functools.cached_property
+    def table(self):
+        # 결과 테이블 셀 텍스트 (천 단위 콤마 포함, 실제 화면과 같은 문자열)
+        rng = np.random.default_rng(self.seed)
+        n = self.rows
+        cols = [rng.choice(self.centers[:4], n), rng.choice(self.camps or ["CAMP00"], n),
+                rng.choice(self.units[:2], n), rng.choice(self.exsd, n)]
+        cols += [[f"{v:,}" for v in rng.integers(0, 50000, n)] for _ in range(6)]
+        cols += [[f"{v:.2f}" for v in rng.random(n) * 100] for _ in range(4)]
+        return [list(map(str, row)) for row in zip(*cols)]
+
+    def payload(self):
+        # _EXTRACT_TABLE_JS 가 돌려주는 모양 그대로
+        return {"index": self.extra_tables, "headers": list(HEADERS), "rows": self.table}
+
+    def payloads(self):
+        # _EXTRACT_TABLE_JS({all: true}) 모양: 장식용 표들 + 결과 표 (문서 순서)
+        decoys = [{"index": i, "headers": ["구분", "값", "비율", "비고"],
+                   "rows": [[f"항목{i}-{r}", str(r * 10), f"{r}%", "-"] for r in range(8)]} for i in range(self.extra_tables)]
+        return decoys + [self.payload()]
+
+    def json_body(self):
+        # 검색 API 응답 (capture_url=data\.json, capture_json_path=data.list)
+        records = [dict(zip(HEADERS, row)) for row in self.table]
+        return json.dumps({"code": 0, "data": {"total": len(records), "list": records}}, ensure_ascii=False)
+
+    def html(self, static_rows=True):
+        config = {"latencyMs": self.latency_ms, "centers": self.centers, "units": self.units,
+                  "camps": self.camps, "exsd": self.exsd, "headers": HEADERS}
+        decoys = "".join(_decoy_table(i) for i in range(self.extra_tables))
+        body = "".join(_tr(row) for row in self.table) if static_rows else ""
+        return (PAGE_TEMPLATE
+                .replace("__CONFIG__", json.dumps(config, ensure_ascii=False))
+                .replace("__DAYS__", "".join(f"<td>{d}</td>" for d in range(1, 32)))
+                .replace("__DECOYS__", decoys)
+                .replace("__HEAD__", _tr(HEADERS, "th"))
+                .replace("__BODY__", body))
+
+    def write(self, folder, static_rows=True):
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, "index.html"), "w", encoding="utf-8") as f:
+            f.write(self.html(static_rows))
+        with open(os.path.join(folder, "data.json"), "w", encoding="utf-8") as f:
+            f.write(self.json_body())
+        return os.path.join(folder, "index.html")
+
+
+def _tr(cells, tag="td"):
+    return "<tr>" + "".join(f"<{tag}>{html.escape(c)}</{tag}>" for c in cells) + "</tr>"
+
+
+def _decoy_table(i):
+    # 전체 스캔 비용을 만드는 작은 표 (공지/요약 등)
+    rows = "".join(_tr([f"항목{i}-{r}", str(r * 10), f"{r}%", "-"]) for r in range(8))
+    return f"<table class='decoy'><thead>{_tr(['구분', '값', '비율', '비고'], 'th')}</thead><tbody>{rows}</tbody></table>"
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(folder, port=0):
+    # 백그라운드 스레드의 로컬 HTTP 서버 -> (server, index_url)
+    handler = functools.partial(_QuietHandler, directory=folder)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>zxc replica</title>
+<style>
+body { font-family: sans-serif; font-size: 13px; }
+.menu { display: none; border: 1px solid #ccc; padding: 4px; max-height: 240px; overflow: auto; }
+.menu.show { display: block; }
+.selected { background: #cde; }
+table { border-collapse: collapse; margin: 8px 0; }
+td, th { border: 1px solid #ddd; padding: 2px 6px; }
+</style></head>
+<body>
+<form id="searchForm" onsubmit="return false;">
+<div>
+  <div>
+    <div>
+      <div>기간</div>
+      <div><div>
+        <div><button type="button" data-menu="m-cal"><div>날짜 선택</div></button></div>
+        <div class="menu" id="m-cal"><table class="cal"><tr>__DAYS__</tr></table></div>
+      </div></div>
+    </div>
+    <div>
+      <div><div><div>
+        <button type="button" data-menu="m-type">배송유형</button>
+        <div class="menu" id="m-type"><button type="button" class="all">Select All</button><button type="button" class="clear">Clear</button></div>
+      </div></div></div>
+      <div><div><div>
+        <button type="button" data-menu="m-sub">정기배송</button>
+        <div class="menu" id="m-sub"><div><div><button type="button" class="all">Select All</button><button type="button" class="clear">Clear</button></div></div></div>
+      </div></div></div>
+      <div><div><div>
+        <button type="button" data-menu="m-exsd" data-fill="exsd">ExSD</button>
+        <div class="menu" id="m-exsd"></div>
+      </div></div></div>
+      <div><div><div>
+        <button type="button" data-menu="m-unit" data-fill="units">단위</button>
+        <ul class="menu" id="m-unit"></ul>
+      </div></div></div>
+    </div>
+  </div>
+  <div>
+    <div id="centerIdListContainer"><div><div>
+      <button type="button" data-menu="m-center" data-fill="centers">센터</button>
+      <ul class="menu" id="m-center"></ul>
+    </div></div></div>
+    <div id="campCodeListContainer"><div><div>
+      <button type="button" data-menu="m-camp"><div><div>캠프</div></div></button>
+      <div class="menu" id="m-camp"><div><input placeholder="검색"></div><div><div><button type="button" class="all">Select All</button><button type="button" class="clear">Clear</button></div></div></div>
+    </div></div></div>
+  </div>
+</div>
+</form>
+<div id="notices">__DECOYS__</div>
+<table id="resultTable"><thead>__HEAD__</thead><tbody>__BODY__</tbody></table>
+<script>
+var CFG = __CONFIG__;
+var searchTimer = null;
+function later(fn) { setTimeout(fn, CFG.latencyMs); }
+function fill(menu, kind) {
+    // 열 때마다 옵션을 다시 그림 (실제 화면처럼 지연 후 채워짐)
+    var html = '';
+    CFG[kind].forEach(function (label) {
+        html += menu.tagName === 'UL' ? '<li><a href="#">' + label + '</a></li>' : '<div><a href="#">' + label + '</a></div>';
+    });
+    menu.innerHTML = html;
+}
+function search() {
+    // 선택이 바뀌면 지연 후 검색 API 호출 -> 결과 테이블 다시 그림
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(function () {
+        fetch('data.json').then(function (r) { return r.json(); }).then(function (res) {
+            var rows = res.data.list, out = [];
+            for (var i = 0; i < rows.length; i++) {
+                out.push('<tr>' + CFG.headers.map(function (h) { return '<td>' + rows[i][h] + '</td>'; }).join('') + '</tr>');
+            }
+            document.querySelector('#resultTable tbody').innerHTML = out.join('');
+        }).catch(function () {});
+    }, CFG.latencyMs);
+}
+document.addEventListener('click', function (ev) {
+    var opener = ev.target.closest('[data-menu]');
+    if (opener) {
+        var menu = document.getElementById(opener.getAttribute('data-menu'));
+        menu.classList.remove('show');
+        if (opener.getAttribute('data-fill')) menu.innerHTML = '';
+        later(function () {
+            if (opener.getAttribute('data-fill')) fill(menu, opener.getAttribute('data-fill'));
+            menu.classList.add('show');
+        });
+        return;
+    }
+    var option = ev.target.closest('.menu a, .menu button, .menu td');
+    if (!option) return;
+    ev.preventDefault();
+    option.classList.toggle('selected');
+    search();
+});
+</script>
+</body></html>
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 복제본 생성/서빙")
+    parser.add_argument("--out", default="replica_site")
+    parser.add_argument("--options", type=int, default=24)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--extra-tables", type=int, default=3)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--serve", action="store_true", help="HTTP 로 서빙 (검색 시 data.json 을 fetch)")
+    args = parser.parse_args(argv)
+
+    site = Site(args.options, args.rows, args.extra_tables, args.latency_ms)
+    index = site.write(args.out, static_rows=not args.serve)
+    if not args.serve:
+        print(f"file://{os.path.abspath(index)}")
+        return 0
+    server, url = serve(os.path.abspath(args.out))
+    print(url)
+    try: threading.Event().wait()
+    except KeyboardInterrupt: server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
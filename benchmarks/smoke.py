@@ -0,0 +1,259 @@
+# 가짜 드라이버 + 복제본 테이블로 돌리는 시나리오 점검 (크롬 없이). 실패가 하나라도 있으면 종료 코드 1
+#   python benchmarks/smoke.py [시나리오 이름 ...]
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from bench_excel_write import load_app_module
+from bench_suite import make_app
+from fake_driver import FakeDriver
+from replica import Site
+
+
+def fanout_rows_reach_workbook(app_mod, folder):
+    # 센터 2개 조합 -> 세션별 추출 -> 합쳐서 저장. 표에 이미 있는 센터 열과 태그 열이 겹치면 안 됨
+    site = Site(options=6, rows=40, latency_ms=0)
+    app = make_app(app_mod, folder, "http://127.0.0.1/index.html", centers="INC1,INC2", table_id="resultTable")
+    app.driver = app_mod._instrument_driver(FakeDriver(app_mod, site, 0), app.recorder)
+    app._open_worker_browser = lambda cookies, storage: FakeDriver(app_mod, site, 0)
+    try:
+        code = app._run_pipeline()
+        sheet = pd.read_excel(os.path.join(folder, "bench.xlsx"), sheet_name="테스트", header=None, skiprows=33)
+    finally:
+        app.close()
+    assert code == app_mod.EXIT_OK, f"종료 코드 {code}"
+    assert len(sheet) == 2 * len(site.table), f"저장된 행 {len(sheet)} != {2 * len(site.table)}"
+    assert sorted(sheet[0].unique()) == ["INC1", "INC2"], sheet[0].unique()
+
+
+def export_ignores_dtype_changes(app_mod, folder):
+    # 두 번째 추출에서 정수 폭이 바뀌고(int8 -> int16) 빈 칸 때문에 float64 가 돼도 a,b,c 는 다시 쓰지 않음
+    app = make_app(app_mod, folder, "x", export_key="k")
+    first = {"headers": ["k", "v"], "rows": [["1", "10"], ["2", "20"], ["3", "30"]]}
+    second = {"headers": ["k", "v"], "rows": first["rows"] + [["1000", ""]]}
+    try:
+        for payload in (first, second):
+            app._export_table(app_mod._frame_from_payload(payload))
+        dtypes = [str(t) for t in app_mod._frame_from_payload(second).dtypes]
+        sheet = pd.read_excel(os.path.join(folder, "bench.xlsx"), sheet_name="테스트", header=None, skiprows=33)
+    finally:
+        app.close()
+    assert dtypes != ["int8", "int8"], dtypes
+    assert sheet[0].tolist() == [1, 2, 3, 1000], sheet[0].tolist()
+
+
+def export_ignores_text_fallback(app_mod, folder):
+    # 두 번째 추출에서 "-" 때문에 v 가 문자열 열로 남고 d 에 시각이 섞여도 1, 2 행은 다시 쓰지 않음
+    app = make_app(app_mod, folder, "x", export_key="k")
+    first = {"headers": ["k", "v", "d"], "rows": [["1", "10", "2025-11-30"], ["2", "20", "2025-11-30"]]}
+    second = {"headers": ["k", "v", "d"], "rows": first["rows"] + [["3", "-", "2025-11-30 10:00"]]}
+    try:
+        for payload in (first, second):
+            app._export_table(app_mod._frame_from_payload(payload))
+        sheet = pd.read_excel(os.path.join(folder, "bench.xlsx"), sheet_name="테스트", header=None, skiprows=33)
+    finally:
+        app.close()
+    assert sheet[0].tolist() == [1, 2, 3], sheet[0].tolist()
+
+
+def export_state_appends_only_new_rows(app_mod, folder):
+    # 저장마다 사이드카에 새 행의 키만 추가 (JSON 은 행 수와 무관한 크기)
+    app = make_app(app_mod, folder, "x", export_key="k")
+    rows = [[str(i), str(i * 10)] for i in range(40)]
+    sizes = []
+    try:
+        for extra in range(3):
+            rows.append([str(100 + extra), "1"])
+            app._export_table(app_mod._frame_from_payload({"headers": ["k", "v"], "rows": list(rows)}))
+            sizes.append((os.path.getsize(os.path.join(folder, "bench_state.keys")) // 24,
+                          os.path.getsize(os.path.join(folder, "bench_state.json"))))
+    finally:
+        app.close()
+    assert [n for n, _ in sizes] == [41, 42, 43], sizes
+    assert len({j for _, j in sizes}) == 1, sizes
+
+
+def exsd_labels_keep_text(app_mod, folder):
+    # ExSD 라벨은 글자 그대로 저장, 파싱한 시각은 _시각 열로 요약에만. 날짜만 있는 값은 시각 섞인 열에서도 날짜만
+    rows = [["1", "2025-11-30 13:00:05 (WAVE1)", "2025-11-30"], ["2", "2025-11-30 14:10:00 (WAVE2)", "2025-11-30 10:00"]]
+    frame = app_mod._frame_from_payload({"headers": ["k", "ExSD", "d"], "rows": rows})
+    assert list(frame.columns) == ["k", "ExSD", "ExSD_시각", "d"], list(frame.columns)
+    assert str(frame["ExSD_시각"].iloc[1]) == "2025-11-30 14:10:00", frame["ExSD_시각"].tolist()
+    app = make_app(app_mod, folder, "x", export_key="k", summary_group_by="ExSD")
+    try:
+        app._export_table(frame)
+        sheet = pd.read_excel(os.path.join(folder, "bench.xlsx"), sheet_name="테스트", header=None, skiprows=33, dtype=str)
+        summary = pd.read_excel(os.path.join(folder, "bench.xlsx"), sheet_name="테스트2", header=None, skiprows=59, dtype=str)
+    finally:
+        app.close()
+    assert sheet.values.tolist() == rows, sheet.values.tolist()
+    assert summary[0].tolist()[1:3] == ["2025-11-30 13:00", "2025-11-30 14:00"], summary[0].tolist()
+
+
+class _LayoutTableDriver(FakeDriver):
+    # 결과 표 앞에 레이아웃용 1행 table 이 있는 화면 (getElementsByTagName('table') 기준 0번, 결과 표는 2번)
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.installed = []
+
+    def execute_script(self, script, *args):
+        if script is self.app._EXTRACT_TABLE_JS and (args[0] or {}).get("all"):
+            self.execute("executeScript")
+            data = self.site.payload()
+            return [{"index": 0, "headers": [], "rows": [["메뉴", "로그아웃"]]}, dict(data, index=2)]
+        if script is self.app._WATCH_INSTALL_JS:
+            self.execute("executeScript")
+            self.installed.append(args[0])
+            return None
+        return super().execute_script(script, *args)
+
+
+def watch_skips_layout_tables(app_mod, folder):
+    # table_* 설정이 없으면 감시 대상도 table_rule(기본 largest)로 고름
+    site = Site(options=6, rows=40, latency_ms=0)
+    app = make_app(app_mod, folder, "x")
+    driver = _LayoutTableDriver(app_mod, site, 0)
+    app.driver = driver
+    try:
+        app._install_watch()
+    finally:
+        app.close()
+    assert driver.installed == [2], driver.installed
+
+
+class _MissingControlDriver(FakeDriver):
+    # "missing" 이 들어간 XPath 는 화면에 없음
+    def find_element(self, by="xpath", value=None):
+        if "missing" in (value or ""):
+            self.execute("findElement")
+            raise self.app.NoSuchElementException(value)
+        return super().find_element(by, value)
+
+
+def missing_optional_step_is_cheap(app_mod, folder):
+    # 항상 없는 선택 단계: 첫 실행은 기본 1초 한 번, 그 뒤로는 실패를 기억해서 더 짧게. 필수 단계는 재시도 후 중단
+    app = make_app(app_mod, folder, "x")
+    app.driver = app_mod._instrument_driver(_MissingControlDriver(app_mod, Site(latency_ms=0), 0), app.recorder)
+    optional = {"type": "button", "name": "선택 버튼", "xpath": "//button[@id='missing']", "wait": {"until": "none"}}
+    app.dropdown_settings = [optional]
+    try:
+        costs = []
+        for _ in range(3):
+            t0 = time.perf_counter()
+            app._configure_page_settings()
+            costs.append(time.perf_counter() - t0)
+            assert app.last_step_report[0]["attempts"] == 1, app.last_step_report
+        app.dropdown_settings = [dict(optional, name="필수 버튼", critical=True)]
+        try:
+            app._configure_page_settings()
+            raise AssertionError("필수 단계 실패인데 중단되지 않음")
+        except app_mod._StepAborted:
+            pass
+        attempts = app.last_step_report[0]["attempts"]
+    finally:
+        app.close()
+    assert costs[0] < 1.5 and max(costs[1:]) < 0.8, [round(c, 2) for c in costs]
+    assert attempts == app.step_retries + 1, attempts
+
+
+def slow_step_is_not_a_miss(app_mod, folder):
+    # 버튼은 눌렸고 완료 조건만 시간 초과 -> 실패가 아니라 느린 표본. 다음 대기 한도가 줄지 않음
+    app = make_app(app_mod, folder, "x", step_retries=0)
+    app.driver = app_mod._instrument_driver(_MissingControlDriver(app_mod, Site(latency_ms=0), 0), app.recorder)
+    step = {"type": "button", "name": "느린 버튼", "xpath": "//button[@id='slow']",
+            "wait": {"until": "visible", "xpath": "//div[@id='missing']"}}
+    app.dropdown_settings = [step]
+    try:
+        app._configure_page_settings()
+        report = app.last_step_report[0]
+        latency = app.locator_cache.latency("느린 버튼")
+        timeout, _, _ = app._step_budget("느린 버튼", step)
+    finally:
+        app.close()
+    assert report["ok"] and not report["ready"], report
+    assert latency["miss"] == 0 and latency["n"] == 1, latency
+    assert timeout >= 1.0, timeout
+
+
+def export_worker_survives_failures(app_mod, folder):
+    # 저장 중 예외 + 로그 출력까지 실패(stdout 끊김)해도 Future 는 예외로 끝나고 다음 작업은 정상 처리
+    calls = []
+    def save(target, df, with_secondary, last):
+        calls.append(len(df))
+        if len(calls) == 1: raise ValueError("디스크 오류")
+        return "ok.xlsx", "saved"
+    def log(message, level="INFO"):
+        raise BrokenPipeError(message)
+    worker = app_mod._ExportWorker(save, log)
+    frame = pd.DataFrame({"k": [1, 2]})
+    try:
+        try:
+            worker.submit("a.xlsx", frame).result(timeout=5)
+            raise AssertionError("실패한 작업이 성공으로 끝남")
+        except ValueError:
+            pass
+        assert worker.submit("a.xlsx", frame).result(timeout=5) == ("ok.xlsx", "saved")
+    finally:
+        worker.close(timeout=5)
+    # 앱 경로: 쓰기 예외는 실패 결과로 (대기 없이 None)
+    app = make_app(app_mod, folder, "x")
+    app._write_to_excel_file = lambda *args, **kwargs: (_ for _ in ()).throw(RuntimeError("쓰기 실패"))
+    try:
+        assert app._export_table(frame) is None
+    finally:
+        app.close()
+
+
+def export_close_is_bounded(app_mod, folder):
+    # 워크북이 잠긴 채로 창을 닫아도 재시도 대기(최대 export_retry_sec)를 끊고 바로 임시 저장 후 종료
+    def save(target, df, with_secondary, last):
+        if not last: raise PermissionError(target["path"])
+        return "tmp.xlsx", "saved"
+    worker = app_mod._ExportWorker(save, lambda *a, **k: None, retry_sec=600)
+    future = worker.submit({"path": "a.xlsx"}, pd.DataFrame({"k": [1]}))
+    time.sleep(0.2)
+    start = time.perf_counter()
+    worker.close(timeout=5)
+    assert time.perf_counter() - start < 1, "close 가 재시도 대기에 막힘"
+    assert future.result(timeout=0) == ("tmp.xlsx", "saved")
+    # 저장 스레드는 넘겨받은 위치만 사용 (Tk 변수는 읽지 않음)
+    app = make_app(app_mod, folder, "x")
+    try:
+        target = app._export_target()
+        class NoGet:
+            def get(self): raise AssertionError("저장 스레드에서 Tk 변수 읽음")
+        for name in ("excel_path", "sheet_name", "start_row", "secondary_sheet_name", "secondary_start_row"):
+            setattr(app, name, NoGet())
+        saved_path, status = app._queue_rows(pd.DataFrame({"k": [1, 2]}), target=target).result(timeout=30)
+        assert status == "saved" and saved_path == target["path"], status
+    finally:
+        app.close()
+
+
+SCENARIOS = [fanout_rows_reach_workbook, export_ignores_dtype_changes, export_ignores_text_fallback,
+             export_state_appends_only_new_rows, exsd_labels_keep_text,
+             watch_skips_layout_tables, missing_optional_step_is_cheap, slow_step_is_not_a_miss,
+             export_worker_survives_failures, export_close_is_bounded]
+
+
+def main(argv=None):
+    names = set(argv if argv is not None else sys.argv[1:])
+    app_mod = load_app_module()
+    failed = 0
+    for scenario in SCENARIOS:
+        if names and scenario.__name__ not in names: continue
+        with tempfile.TemporaryDirectory() as folder:
+            try:
+                scenario(app_mod, folder)
+                print(f"ok    {scenario.__name__}")
+            except Exception as e:
+                failed += 1
+                print(f"FAIL  {scenario.__name__}: {type(e).__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,32 +1,1233 @@
+import time
+_PROCESS_T0 = time.perf_counter()  # 시작 시간 측정 기준
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
-import time
 import io
 import threading
+import queue
+import logging
+import logging.handlers
+import urllib.request
+import json
+import base64
 import os 
+import sys
+import copy
+import shutil
+import argparse
+import itertools
+import contextlib
+import collections
+import uuid
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, Future
+import re
+import math
+import numbers
+import zipfile
+import tempfile
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape as _xml_escape
 from datetime import datetime
 
-# Selenium 및 라이브러리
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import Select 
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+# 무거운 라이브러리(pandas/numpy/Selenium/xlsxwriter)는 창을 먼저 띄우고 첫 사용 시 로드.
+# GUI 는 시작 직후 백그라운드 스레드에서 미리 불러둔다 (_ensure_heavy_imports)
+pd = np = None
+webdriver = Options = By = WebDriverWait = EC = Select = None
+TimeoutException = NoSuchElementException = None
+_heavy_lock = threading.Lock()
+_heavy_loaded = False
+
+def _ensure_heavy_imports():
+    global pd, np, webdriver, Options, By, WebDriverWait, EC, Select, TimeoutException, NoSuchElementException, _heavy_loaded
+    if _heavy_loaded: return
+    with _heavy_lock:
+        if _heavy_loaded: return
+        import pandas as _pd
+        import numpy as _np
+        import xlsxwriter  # noqa: F401 (ExcelWriter 엔진 미리 로드)
+        from selenium import webdriver as _webdriver
+        from selenium.webdriver.chrome.options import Options as _Options
+        from selenium.webdriver.common.by import By as _By
+        from selenium.webdriver.support.ui import WebDriverWait as _WebDriverWait, Select as _Select
+        from selenium.webdriver.support import expected_conditions as _EC
+        from selenium.common.exceptions import TimeoutException as _Timeout, NoSuchElementException as _NoSuchElement
+
+        # Pandas 설정
+        _pd.set_option('display.width', 1000)
+        _pd.set_option('display.max_rows', 10)
+        _pd.set_option('display.max_columns', None)
+
+        pd, np = _pd, _np
+        webdriver, Options, By, WebDriverWait, EC, Select = _webdriver, _Options, _By, _WebDriverWait, _EC, _Select
+        TimeoutException, NoSuchElementException = _Timeout, _NoSuchElement
+        _heavy_loaded = True
+
+# 페이지 변화 감지용 프로브 (MutationObserver + XHR/fetch 카운터). 페이지당 1회 설치
+_PAGE_PROBE_JS = """
+if (!window.__zxcProbe) {
+    var p = window.__zxcProbe = {domLast: performance.now(), netLast: performance.now(), inflight: 0};
+    new MutationObserver(function () { p.domLast = performance.now(); })
+        .observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        p.inflight++; p.netLast = performance.now();
+        this.addEventListener('loadend', function () { p.inflight--; p.netLast = performance.now(); });
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var origFetch = window.fetch;
+        window.fetch = function () {
+            p.inflight++; p.netLast = performance.now();
+            return origFetch.apply(this, arguments).finally(function () { p.inflight--; p.netLast = performance.now(); });
+        };
+    }
+}
+"""
+
+# DOM/네트워크가 quiet_ms 동안 잠잠해지는 순간 반환 (execute_async_script, 왕복 1회)
+_WAIT_QUIET_JS = _PAGE_PROBE_JS + """
+var kind = arguments[0], quietMs = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var p = window.__zxcProbe, start = performance.now();
+(function tick() {
+    var now = performance.now();
+    var quiet = kind === 'net' ? (p.inflight <= 0 && now - p.netLast >= quietMs) : (now - p.domLast >= quietMs);
+    if (quiet) { done(true); return; }
+    if (now - start >= timeoutMs) { done(false); return; }
+    setTimeout(tick, 20);
+})();
+"""
+
+# 옵션 선택 상태: 옵션 또는 바로 위 요소의 aria-selected/aria-checked, 체크박스, selected/active/checked 클래스
+# true/false = 상태 표시가 있음, null = 화면이 선택 상태를 드러내지 않음 (확인 불가)
+_SELECTED_STATE_FN_JS = """
+function selState(el) {
+    for (var n = el, d = 0; n && n.getAttribute && d < 2; n = n.parentElement, d++) {
+        var aria = n.getAttribute('aria-selected') || n.getAttribute('aria-checked');
+        if (aria) return aria === 'true';
+        var box = n.querySelector('input[type=checkbox], input[type=radio]');
+        if (box) return box.checked;
+        if (/(^|\\s)(selected|active|checked)(\\s|$)/.test(n.getAttribute('class') || '')) return true;
+    }
+    return null;
+}
+"""
+
+# 옵션 탐색 + 조건 판정 + 클릭을 브라우저 안에서 한 번에 처리 (WebDriver 왕복 1회)
+# 이미 선택된 옵션은 다시 누르지 않음 (토글 해제 방지, 재시도 시 남은 것만 클릭)
+# arguments: container_xpath, option_xpath, {kind, value, fallback, limit}
+_BATCH_SELECT_JS = _SELECTED_STATE_FN_JS + """
+var containerXpath = arguments[0], optionXpath = arguments[1], pred = arguments[2] || {};
+function byXpath(xp, ctx) {
+    var r = document.evaluate(xp, ctx || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var out = [];
+    for (var i = 0; i < r.snapshotLength; i++) out.push(r.snapshotItem(i));
+    return out;
+}
+function hourOf(text) {
+    var parts = text.split(/\\s+/);
+    for (var i = 0; i < parts.length; i++) {
+        if (parts[i].indexOf(':') < 0) continue;
+        var h = parseInt(parts[i].split(':')[0], 10);
+        if (!isNaN(h)) return h;
+    }
+    return -1;
+}
+var nodes;
+if (containerXpath) {
+    var container = byXpath(containerXpath)[0];
+    nodes = container ? byXpath(optionXpath, container) : (pred.fallback ? byXpath(pred.fallback) : []);
+} else {
+    nodes = byXpath(optionXpath);
+}
+var labels = [], already = 0;
+for (var i = 0; i < nodes.length; i++) {
+    var el = nodes[i], text = (el.innerText || el.textContent || '').trim(), hit;
+    if (pred.kind === 'hour_gte') hit = hourOf(text) >= pred.value;
+    else if (pred.kind === 'contains') hit = text.indexOf(pred.value) >= 0;
+    else if (pred.kind === 'equals') hit = text === pred.value;
+    else hit = true;
+    if (!hit) continue;
+    if (selState(el) === true) { already++; }
+    else { try { el.click(); labels.push(text); } catch (e) {} }
+    if (pred.limit && labels.length + already >= pred.limit) break;
+}
+return {count: labels.length, labels: labels, scanned: nodes.length, already: already};
+"""
+
+# 클릭한 옵션이 선택 상태로 보이는지 확인 (labels 로 좁힘) -> {selected, unselected, unknown}
+# arguments: container_xpath, option_xpath, labels
+_SELECTION_STATE_JS = _SELECTED_STATE_FN_JS + """
+var containerXpath = arguments[0], optionXpath = arguments[1], labels = arguments[2];
+function byXpath(xp, ctx) {
+    var r = document.evaluate(xp, ctx || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var out = [];
+    for (var i = 0; i < r.snapshotLength; i++) out.push(r.snapshotItem(i));
+    return out;
+}
+var container = containerXpath ? byXpath(containerXpath)[0] : null;
+var nodes = containerXpath && !container ? [] : byXpath(optionXpath, container);
+var out = {selected: 0, unselected: 0, unknown: 0};
+for (var i = 0; i < nodes.length; i++) {
+    if (labels && labels.indexOf((nodes[i].innerText || nodes[i].textContent || '').trim()) < 0) continue;
+    var st = selState(nodes[i]);
+    if (st === true) out.selected++;
+    else if (st === false) out.unselected++;
+    else out.unknown++;
+}
+return out;
+"""
+
+# 지정한 테이블 하나만 골라 셀 텍스트를 배열로 반환 (page_source 전체 다운로드/파싱 생략)
+# arguments: {id, xpath, headers: [...], columns} -> {index, headers, rows} | null
+#            {all: true} 이면 조건에 맞는 모든 테이블의 [{index, headers, rows}, ...] (감시 대상 고르기용)
+_EXTRACT_TABLE_JS = """
+var spec = arguments[0] || {};
+function cellsOf(tr) {
+    var out = [];
+    for (var i = 0; i < tr.cells.length; i++) out.push((tr.cells[i].innerText || tr.cells[i].textContent || '').trim());
+    return out;
+}
+function headerRow(t) {
+    if (t.tHead && t.tHead.rows.length) return t.tHead.rows[t.tHead.rows.length - 1];
+    var first = t.rows[0];
+    return first && first.querySelector('th') ? first : null;
+}
+var tables = Array.prototype.slice.call(document.getElementsByTagName('table'));
+var candidates = tables;
+if (spec.id) {
+    var byId = document.getElementById(spec.id);
+    candidates = byId ? [byId.tagName === 'TABLE' ? byId : byId.querySelector('table')] : [];
+} else if (spec.xpath) {
+    var node = document.evaluate(spec.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    candidates = node ? [node.tagName === 'TABLE' ? node : node.querySelector('table')] : [];
+}
+var wanted = spec.headers || [], found = [];
+for (var c = 0; c < candidates.length; c++) {
+    var t = candidates[c];
+    if (!t) continue;
+    var head = headerRow(t), headers = head ? cellsOf(head) : [];
+    var ok = wanted.every(function (h) { return headers.some(function (x) { return x.indexOf(h) >= 0; }); });
+    if (ok && spec.columns) ok = headers.length === spec.columns || (t.rows[t.rows.length - 1] || {cells: []}).cells.length === spec.columns;
+    if (!ok) continue;
+    var rows = [];
+    for (var r = 0; r < t.rows.length; r++) {
+        if (t.rows[r] === head || (t.tHead && t.rows[r].parentNode === t.tHead)) continue;
+        rows.push(cellsOf(t.rows[r]));
+    }
+    var item = {index: tables.indexOf(t), headers: headers, rows: rows};
+    if (!spec.all) return item;
+    found.push(item);
+}
+return spec.all ? found : null;
+"""
+
+# 후보 XPath 중 지금 화면에 보이는 첫 번째의 인덱스 (-1: 없음). 실패한 후보마다 대기하지 않도록 한 번에 확인
+_FIRST_VISIBLE_JS = """
+var xps = arguments[0] || [];
+for (var i = 0; i < xps.length; i++) {
+    try {
+        var el = document.evaluate(xps[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (el && el.getClientRects().length > 0) return i;
+    } catch (e) {}
+}
+return -1;
+"""
+
+# 결과 표 다음 페이지로: 'next' 는 버튼 클릭(비활성이면 false), 'scroll' 은 가상 스크롤 컨테이너를 한 화면 내림(끝이면 false)
+# arguments: mode, xpath
+_ADVANCE_PAGE_JS = """
+var mode = arguments[0], xpath = arguments[1];
+var el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!el) return false;
+if (mode === 'scroll') {
+    var before = el.scrollTop;
+    el.scrollTop = before + Math.max(el.clientHeight, 1);
+    return el.scrollTop > before;
+}
+var cls = typeof el.className === 'string' ? el.className : '';
+if (el.disabled || el.getAttribute('aria-disabled') === 'true' || /(^|\\s)disabled(\\s|$)/.test(cls)) return false;
+el.click();
+return true;
+"""
+
+# 실시간 감시: 대상 테이블(getElementsByTagName('table')[index])에 MutationObserver 설치 -> 현재 {keys, rows} 반환
+# 행 키는 keyIdx 열(없으면 행 전체)을 \u0001 로 이은 문자열
+# arguments: table_index, key_idx
+_WATCH_INSTALL_JS = """
+var t = document.getElementsByTagName('table')[arguments[0]], keyIdx = arguments[1] || [];
+if (!t) return null;
+if (window.__zxcWatch) window.__zxcWatch.observer.disconnect();
+var w = window.__zxcWatch = {table: t, dirty: false};
+w.read = function () {
+    var head = t.tHead && t.tHead.rows.length ? null : (t.rows[0] && t.rows[0].querySelector('th') ? t.rows[0] : null);
+    var out = Object.create(null);
+    for (var r = 0; r < t.rows.length; r++) {
+        var tr = t.rows[r];
+        if (tr === head || (t.tHead && tr.parentNode === t.tHead)) continue;
+        var cells = [];
+        for (var i = 0; i < tr.cells.length; i++) cells.push((tr.cells[i].innerText || tr.cells[i].textContent || '').trim());
+        out[keyIdx.length ? keyIdx.map(function (k) { return cells[k]; }).join('\u0001') : cells.join('\u0001')] = cells;
+    }
+    return out;
+};
+w.rows = w.read();
+w.observer = new MutationObserver(function () { w.dirty = true; });
+w.observer.observe(t, {childList: true, subtree: true, characterData: true});
+var keys = Object.keys(w.rows);
+return {keys: keys, rows: keys.map(function (k) { return w.rows[k]; })};
+"""
+
+# 감시 중인 테이블의 변경분만 반환: 변화 없으면 null, 테이블이 다시 그려져 분리됐으면 {lost: true}
+_WATCH_POLL_JS = """
+var w = window.__zxcWatch;
+if (!w || !w.table.isConnected) return {lost: true};
+if (!w.dirty) return null;
+w.dirty = false;
+var now = w.read(), inserted = [], updated = [], removed = [];
+for (var k in now) {
+    var old = w.rows[k];
+    if (old === undefined) inserted.push([k, now[k]]);
+    else if (old.join('\u0001') !== now[k].join('\u0001')) updated.push([k, now[k]]);
+}
+for (var k2 in w.rows) if (!(k2 in now)) removed.push(k2);
+w.rows = now;
+if (!inserted.length && !updated.length && !removed.length) return null;
+return {inserted: inserted, updated: updated, removed: removed};
+"""
+
+# 로그 패널: 워커는 큐에 넣기만 하고, Tk 메인 루프가 주기적으로 한꺼번에 그림
+LOG_FLUSH_MS = 50          # 화면 반영 주기 (약 20fps)
+LOG_BATCH_MAX = 500        # 1회 반영 최대 건수
+LOG_MAX_LINES = 2000       # Text 위젯 최대 줄 수 (넘으면 오래된 줄부터 삭제)
+EXPORT_CLOSE_SEC = 10      # 창 닫을 때 남은 저장을 기다리는 최대 시간
+_LOG_LEVELS = {"INFO": logging.INFO, "SUCCESS": logging.INFO, "DETAIL": logging.DEBUG,
+               "WARNING": logging.WARNING, "ERROR": logging.ERROR}
+
+def _start_file_logger(path, max_bytes=1_000_000, backup_count=5):
+    # 회전 로그 파일. 파일 쓰기는 QueueListener 스레드에서 처리 (호출 스레드는 막히지 않음)
+    logger = logging.getLogger("zxc")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    try:
+        file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    except OSError:
+        return logger, None
+    file_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    record_queue = queue.SimpleQueue()
+    logger.handlers = [logging.handlers.QueueHandler(record_queue)]
+    listener = logging.handlers.QueueListener(record_queue, file_handler)
+    listener.start()
+    return logger, listener
+
+def _debug_port_alive(port, timeout=0.3):
+    # 원격 디버깅 포트로 떠 있는 크롬이 있는지 (DevTools HTTP 엔드포인트 확인)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=timeout) as resp:
+            return resp.status == 200
+    except Exception:
+        return False
+
+def _session_healthy(driver):
+    # 왕복 1회로 세션 생존 확인
+    try: return driver.execute_script("return document.readyState") is not None
+    except Exception: return False
+
+# wait 조건을 지정하지 않은 단계의 기본 대기 조건
+_DEFAULT_STEP_WAIT = {"until": "dom_quiet", "quiet_ms": 100}
+
+# 반복 라벨 열 (이름에 포함되면 category). 그 밖의 문자열 열은 고유값이 절반 이하일 때만
+_CATEGORY_COLUMNS = ("센터", "캠프", "단위")
+_DATETIME_RE = r"^\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2})?)?$"
+# ExSD 라벨 "2025-11-30 13:00:05 (WAVE1)": 라벨은 글자 그대로 두고 바로 오른쪽에 시각만 파싱한 "<열>_시각" 열을 붙임
+# (_시각 열은 집계/이력용, 엑셀에는 쓰지 않음 -> _workbook_frame)
+_LABELLED_DATETIME_RE = r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2})?\s*\(.+\)$"
+_STAMP_SUFFIX = "_시각"
+
+def _normalize_frame(df):
+    # 추출 직후 1회, 열 단위 벡터 연산으로 타입 정리 (열만 교체, 프레임 복사 없음)
+    #   숫자 문자열(천 단위 콤마 포함) -> 숫자 (정수는 가장 작은 정수형, 실수는 엑셀 값 보존을 위해 float64 유지)
+    #   날짜 문자열 -> datetime / 반복 라벨(센터/캠프/단위) -> category
+    #   ExSD 라벨("날짜 시각 (WAVE n)") -> 라벨은 그대로(반복이면 category) + 오른쪽에 "<열>_시각" datetime 열 추가
+    # 미리보기, 변경 감지, 엑셀 저장, 이력 저장이 모두 이 프레임 하나를 같이 씀
+    n = len(df)
+    stamps = []
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        if pd.api.types.is_integer_dtype(col) and not isinstance(col.dtype, pd.CategoricalDtype):
+            df.isetitem(i, pd.to_numeric(col, downcast="integer"))
+            continue
+        if not (pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col)): continue
+        text = col.astype("string").str.strip()
+        filled = text.notna() & (text != "")
+        if not filled.any(): continue
+        # 문자열 -> float 캐스팅은 숫자가 아닌 값에서 바로 실패하므로 라벨 열은 거의 비용 없이 건너뜀
+        # (16자리 이상은 주문번호 같은 코드로 보고 문자열 유지: float 로 바꾸면 자릿수가 깨짐)
+        numbers = None
+        if text[filled].str.len().max() <= 15:
+            try: numbers = text.str.replace(",", "", regex=False).where(filled).astype("float64").to_numpy()
+            except (ValueError, TypeError): pass
+        if numbers is not None:
+            values = pd.Series(numbers, index=df.index)
+            if np.isfinite(numbers).all() and (numbers == np.round(numbers)).all():
+                values = pd.to_numeric(values.astype(np.int64), downcast="integer")
+            df.isetitem(i, values)
+            continue
+        if text[filled].str.fullmatch(_DATETIME_RE).all():
+            df.isetitem(i, pd.to_datetime(text.where(filled), errors="coerce", format="ISO8601"))
+            continue
+        name = df.columns[i][-1] if isinstance(df.columns[i], tuple) else df.columns[i]
+        if not isinstance(df.columns[i], tuple) and text[filled].str.fullmatch(_LABELLED_DATETIME_RE).all():
+            when = pd.to_datetime(text.str.extract(_DATETIME_IN_TEXT_RE, expand=False), errors="coerce", format="ISO8601")
+            if f"{name}{_STAMP_SUFFIX}" not in df.columns: stamps.append((i + 1, f"{name}{_STAMP_SUFFIX}", when))
+        labelled = any(key in str(name) for key in _CATEGORY_COLUMNS)
+        if labelled or (n >= 50 and text.nunique() * 2 <= n):
+            df.isetitem(i, col.astype("category"))
+    for loc, name, when in reversed(stamps): df.insert(loc, name, when)
+    return df
+
+def _stamp_columns(columns):
+    # _normalize_frame 이 붙인 "<열>_시각" 열 이름 (바로 왼쪽이 원래 라벨 열인 것만)
+    columns = list(columns)
+    return [c for i, c in enumerate(columns) if i and isinstance(c, str) and c == f"{columns[i - 1]}{_STAMP_SUFFIX}"]
+
+def _workbook_frame(df):
+    # 엑셀에 쓰는 모양: 파싱해서 붙인 _시각 열은 빼고 추출한 표 그대로
+    stamps = _stamp_columns(df.columns)
+    return df.drop(columns=stamps) if stamps else df
+
+# "2025-11-30 06:00:05 (WAVE3)" 같은 라벨에서 날짜/시각 부분만 추출 (ExSD _시각 열, 요약 시간 구간)
+_DATETIME_IN_TEXT_RE = r"(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2})?)"
+_SUMMARY_COUNT_COL = "건수"
+
+def _summary_keys(df, group_by, time_col=None, bucket=None):
+    # 그룹 키 열 -> 문자열 (누계를 JSON 으로 들고 다니므로). time_col 은 bucket(1h, 30min ...) 단위로 내림
+    keys = {}
+    for c in group_by:
+        col = df[c]
+        if c == time_col and bucket:
+            stamp = df.get(f"{c}{_STAMP_SUFFIX}")
+            when = stamp if stamp is not None else col if pd.api.types.is_datetime64_any_dtype(col) else \
+                pd.to_datetime(col.astype(str).str.extract(_DATETIME_IN_TEXT_RE, expand=False), errors="coerce")
+            col = when.dt.floor(bucket).dt.strftime("%Y-%m-%d %H:%M").where(when.notna(), col.astype(object))
+        keys[c] = col.astype(object).where(col.notna(), "").astype(str)
+    return pd.DataFrame(keys, index=df.index)
+
+def _summarize(df, group_by, sum_cols, time_col=None, bucket=None):
+    # 새 행만 벡터 집계 -> [그룹 키..., 건수, 합계 열...]
+    keys = _summary_keys(df, group_by, time_col, bucket)
+    values = df[list(sum_cols)].apply(pd.to_numeric, errors="coerce")
+    grouped = values.groupby([keys[c] for c in group_by], sort=False)
+    out = grouped.sum()
+    out.insert(0, _SUMMARY_COUNT_COL, grouped.size())
+    return out.reset_index()
+
+def _merge_summary(prev, new, group_by):
+    # 누계 + 이번 집계 (그룹 수만큼의 작은 프레임끼리 합산). 정수로 떨어지는 합계 열은 정수로
+    out = new if prev is None or prev.empty else pd.concat([prev, new], ignore_index=True)
+    out = out.groupby(group_by, sort=True).sum().reset_index()
+    for c in out.columns[len(group_by):]:
+        values = out[c].to_numpy()
+        if values.dtype.kind == "f" and np.isfinite(values).all() and (values == np.round(values)).all():
+            out[c] = values.astype(np.int64)
+    return out
+
+def _summary_block(summary, group_by):
+    # 보조 시트에 쓸 블록: 머리글 1행 + 그룹별 행 + 합계 행
+    totals = ["합계"] + [""] * (len(group_by) - 1) + summary.iloc[:, len(group_by):].sum().tolist()
+    rows = [[str(c) for c in summary.columns]] + summary.to_dict("split")["data"] + [totals]
+    return pd.DataFrame(rows, dtype=object)
+
+def _frame_from_payload(payload, normalize=True):
+    # 브라우저에서 받은 {headers, rows} 배열로 바로 DataFrame 구성 (_normalize_frame 으로 타입 정리)
+    rows = payload.get("rows") or []
+    headers = list(payload.get("headers") or [])
+    width = max([len(headers)] + [len(r) for r in rows])
+    headers += [f"col{i}" for i in range(len(headers), width)]
+    rows = [r + [""] * (width - len(r)) for r in rows]
+    df = pd.DataFrame(rows, columns=headers)
+    return _normalize_frame(df) if normalize else df
+
+# ---------------------------------------------------------------------------
+# xlsx 증분 저장 (시트 XML 만 수정, 다른 파트는 그대로 복사)
+# ---------------------------------------------------------------------------
+_XLSX_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_XLSX_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_ROW_RE = re.compile(r'<row\b[^>]*?\br="(\d+)"[^>]*?(?:/>|>.*?</row>)', re.S)
+_CELL_REF_RE = re.compile(r'(<c\b[^>]*?\br=")([A-Z]+)\d+(")')
+_FORMULA_RE = re.compile(r'<f\b[^>]*/>|<f\b[^>]*>.*?</f>', re.S)
+_ILLEGAL_XML_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_CENTER_XF = '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0" applyAlignment="1"><alignment horizontal="center" vertical="center"/></xf>'
+
+def _col_letter(idx):
+    letters = ""
+    idx += 1
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def _col_index(letters):
+    idx = 0
+    for ch in letters: idx = idx * 26 + ord(ch) - 64
+    return idx - 1
+
+def _cell_xml(ref, value, style):
+    s_attr = f' s="{style}"' if style is not None else ""
+    if value is None: return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{s_attr} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, numbers.Integral):
+        return f'<c r="{ref}"{s_attr}><v>{int(value)}</v></c>'
+    if isinstance(value, numbers.Real):
+        if not math.isfinite(value): return ""
+        return f'<c r="{ref}"{s_attr}><v>{float(value)!r}</v></c>'
+    text = _xml_escape(_ILLEGAL_XML_RE.sub("", str(value)))
+    return f'<c r="{ref}"{s_attr} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def _column_blocks(df, fill=None):
+    # 열마다 dtype 을 한 번만 판정해서 (종류, 값 리스트) 반환. 결측/inf 는 fill(기본 None = 빈 칸), 행 위치는 0..n-1 (인덱스 무시)
+    # 저장 시 fill=0 으로 넘기면 replace(inf)/fillna(0) 로 프레임 전체를 복사할 필요가 없음
+    blocks = []
+    for c in range(df.shape[1]):
+        col = df.iloc[:, c]
+        arr = col.to_numpy()
+        kind = arr.dtype.kind
+        if kind in "iu":
+            blocks.append(("num", arr.tolist()))
+        elif kind == "f":
+            values = arr.tolist()
+            bad = ~np.isfinite(arr)
+            if bad.any():
+                for i in np.flatnonzero(bad): values[i] = fill
+            blocks.append(("num", values))
+        elif kind == "b":
+            blocks.append(("bool", arr.tolist()))
+        elif kind == "M":
+            # 값마다: 자정이면 날짜만, 0초면 시:분까지 (열에 시각 있는 행이 섞여도 "2025-11-30" 은 그대로)
+            values = pd.Series(np.datetime_as_string(arr.astype("datetime64[s]"), unit="s"))
+            values = values.str.replace("T00:00:00", "", regex=False).str.replace(r"(T\d{2}:\d{2}):00$", r"\1", regex=True)
+            values = values.str.replace("T", " ", regex=False).to_numpy(dtype=object)
+            missing = col.isna().to_numpy()
+            values[missing] = fill
+            blocks.append(("mixed" if fill is not None and missing.any() else "str", values.tolist()))
+        else:
+            inferred = pd.api.types.infer_dtype(arr, skipna=True)
+            missing = col.isna().to_numpy()
+            values = arr.tolist()
+            if missing.any():
+                for i in np.flatnonzero(missing): values[i] = fill
+            if inferred in ("string", "empty") and (fill is None or not missing.any()):
+                blocks.append(("str", values))
+            else:
+                blocks.append(("mixed", values))
+    return blocks
+
+def _write_frame_xlsxwriter(ws, start_row, df, fmt, fill=None):
+    # 열 단위 일괄 쓰기: 쓰기 함수는 열마다 한 번만 고름
+    for c, (kind, values) in enumerate(_column_blocks(df, fill)):
+        if kind == "num": write = ws.write_number
+        elif kind == "bool": write = ws.write_boolean
+        elif kind == "str": write = ws.write_string
+        else: write = ws.write
+        for r, v in enumerate(values):
+            if v is not None: write(start_row + r, c, v, fmt)
+
+class _XlsxAppender:
+    # 기존 xlsx 를 한 번만 열고, 대상 시트의 마지막 사용 행 뒤에 새 행만 씀.
+    # 다른 시트/서식/수식/차트 파트는 내용 변경 없이 그대로 복사된다.
+    def __init__(self, path):
+        self.path = path
+        self._zin = zipfile.ZipFile(path)
+        names = set(self._zin.namelist())
+        wb = ET.fromstring(self._zin.read("xl/workbook.xml"))
+        rels = ET.fromstring(self._zin.read("xl/_rels/workbook.xml.rels"))
+        targets = {r.get("Id"): r.get("Target", "") for r in rels}
+        self.sheet_parts = {}
+        for sh in wb.iter(f"{{{_XLSX_NS}}}sheet"):
+            target = targets.get(sh.get(f"{{{_XLSX_REL_NS}}}id"), "")
+            part = target.lstrip("/") if target.startswith("/") else "xl/" + target
+            if part in names: self.sheet_parts[sh.get("name")] = part
+        self._modified = {}
+
+    def close(self):
+        self._zin.close()
+
+    def _part(self, part):
+        if part not in self._modified:
+            self._modified[part] = self._zin.read(part).decode("utf-8")
+        return self._modified[part]
+
+    def _sheet(self, name):
+        return self._part(self.sheet_parts[name])
+
+    def can_append(self, name):
+        return name in self.sheet_parts and "<sheetData" in self._sheet(name)
+
+    def last_row(self, name):
+        # 값/수식이 있는 마지막 행 번호 (없으면 0). 보통 맨 끝 행에서 바로 끝남
+        xml = self._sheet(name)
+        pos = xml.rfind("</sheetData>")
+        while pos > 0:
+            start = xml.rfind("<row ", 0, pos)
+            if start < 0: return 0
+            m = _ROW_RE.match(xml, start)
+            if m and ("<v" in m.group(0) or "<is" in m.group(0) or "<f" in m.group(0)):
+                return int(m.group(1))
+            pos = start
+        return 0
 
-# Pandas 설정
-pd.set_option('display.width', 1000)
-pd.set_option('display.max_rows', 10)
-pd.set_option('display.max_columns', None)
+    def center_style(self):
+        # 가운데 정렬 서식 인덱스 (styles.xml 에 없을 때만 1회 추가)
+        if "xl/styles.xml" not in self._zin.namelist(): return None
+        styles = self._part("xl/styles.xml")
+        m = re.search(r'<cellXfs\b[^>]*>(.*?)</cellXfs>', styles, re.S)
+        if not m: return None
+        xfs = re.findall(r'<xf\b[^>]*/>|<xf\b[^>]*>.*?</xf>', m.group(1), re.S)
+        if _CENTER_XF in xfs: return xfs.index(_CENTER_XF)
+        body = m.group(1) + _CENTER_XF
+        head = re.sub(r'count="\d+"', f'count="{len(xfs) + 1}"', styles[m.start():m.start(1)])
+        self._modified["xl/styles.xml"] = styles[:m.start()] + head + body + styles[m.end(1):]
+        return len(xfs)
+
+    def write_frame(self, name, start_idx, df, style=None, fill=None):
+        # 열 블록 단위로 셀 XML 을 만든 뒤 행으로 묶음. start_idx 는 0 기준 행 위치
+        if df.shape[0] == 0: return
+        s_attr = f' s="{style}"' if style is not None else ""
+        row_nos = range(start_idx + 1, start_idx + df.shape[0] + 1)
+        col_cells = []
+        for c, (kind, values) in enumerate(_column_blocks(df, fill)):
+            letter = _col_letter(c)
+            if kind == "num":
+                cells = ["" if v is None else f'<c r="{letter}{r}"{s_attr}><v>{v!r}</v></c>' for r, v in zip(row_nos, values)]
+            elif kind == "bool":
+                cells = ["" if v is None else f'<c r="{letter}{r}"{s_attr} t="b"><v>{int(v)}</v></c>' for r, v in zip(row_nos, values)]
+            elif kind == "str":
+                cells = ["" if v is None else f'<c r="{letter}{r}"{s_attr} t="inlineStr"><is><t xml:space="preserve">{_xml_escape(_ILLEGAL_XML_RE.sub("", v))}</t></is></c>'
+                         for r, v in zip(row_nos, values)]
+            else:
+                cells = [_cell_xml(f"{letter}{r}", v, style) for r, v in zip(row_nos, values)]
+            col_cells.append(cells)
+        new_rows = [(r, f'<row r="{r}">{"".join(cells)}</row>') for r, cells in zip(row_nos, zip(*col_cells))]
+        self._splice(name, new_rows, df.shape[1])
+
+    def copy_rows(self, src_name, first_row, last_row, dst_name, dst_start_idx):
+        # 원본 시트의 행 XML 을 그대로 복사 (수식은 제거하고 계산된 값만 유지)
+        xml = self._sheet(src_name)
+        new_rows = []
+        max_col = 0
+        shift = dst_start_idx + 1 - first_row
+        for m in _ROW_RE.finditer(xml):
+            r = int(m.group(1))
+            if r < first_row: continue
+            if r > last_row: break
+            row = _FORMULA_RE.sub("", m.group(0))
+            row = re.sub(r'^(<row\b[^>]*?\br=")\d+', lambda mm: mm.group(1) + str(r + shift), row)
+            row = _CELL_REF_RE.sub(lambda mm: f"{mm.group(1)}{mm.group(2)}{r + shift}{mm.group(3)}", row)
+            refs = re.findall(r'<c\b[^>]*?\br="([A-Z]+)', row)
+            if refs: max_col = max(max_col, _col_index(refs[-1]) + 1)
+            new_rows.append((r + shift, row))
+        if new_rows: self._splice(dst_name, new_rows, max_col)
+
+    def _splice(self, name, new_rows, max_col):
+        xml = self._sheet(name)
+        first, last = new_rows[0][0], new_rows[-1][0]
+        payload = "".join(x for _, x in new_rows)
+        m_open = re.search(r'<sheetData\s*/>|<sheetData\b[^>]*>', xml)
+        if m_open.group(0).endswith("/>"):
+            xml = xml[:m_open.start()] + "<sheetData>" + payload + "</sheetData>" + xml[m_open.end():]
+        else:
+            end = xml.index("</sheetData>", m_open.end())
+            insert_at, cut_end = end, end
+            tail_start = xml.rfind("<row ", m_open.end(), end)
+            tail = _ROW_RE.match(xml, tail_start) if tail_start >= 0 else None
+            if tail and int(tail.group(1)) >= first:
+                # 기존 행과 겹치는 경우만 전체 탐색 (보통은 끝에 붙이므로 생략)
+                insert_at = cut_end = None
+                for m in _ROW_RE.finditer(xml, m_open.end(), end):
+                    r = int(m.group(1))
+                    if r > last:
+                        if insert_at is None: insert_at = m.start()
+                        break
+                    if r >= first:
+                        if insert_at is None: insert_at = m.start()
+                        cut_end = m.end()
+                if insert_at is None: insert_at = end
+                if cut_end is None or cut_end < insert_at: cut_end = insert_at
+            xml = xml[:insert_at] + payload + xml[cut_end:]
+        self._modified[self.sheet_parts[name]] = self._update_dimension(xml, last, max_col)
+
+    @staticmethod
+    def _update_dimension(xml, last_row, max_col):
+        m = re.search(r'<dimension ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"\s*/>', xml)
+        if not m: return xml
+        end_col = m.group(3) or m.group(1)
+        end_row = int(m.group(4) or m.group(2))
+        if max_col: end_col = _col_letter(max(_col_index(end_col), max_col - 1))
+        ref = f'{m.group(1)}{m.group(2)}:{end_col}{max(end_row, last_row)}'
+        return xml[:m.start()] + f'<dimension ref="{ref}"/>' + xml[m.end():]
+
+    def save(self, target_path):
+        # 같은 폴더에 임시 파일로 쓴 뒤 교체 (중간 실패 시 원본 보존)
+        folder = os.path.dirname(os.path.abspath(target_path))
+        fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=folder)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zout:
+                for info in self._zin.infolist():
+                    if info.filename in self._modified:
+                        zout.writestr(info, self._modified[info.filename].encode("utf-8"))
+                    else:
+                        zout.writestr(info, self._zin.read(info.filename))
+            self._zin.close()
+            os.replace(tmp_path, target_path)
+        except:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            raise
+
+def _find_records(data, path=""):
+    # JSON 응답에서 레코드(dict) 목록 찾기. path("data.list") 가 없으면 가장 긴 dict 리스트
+    if path:
+        for key in path.split("."):
+            data = data[int(key)] if isinstance(data, list) else (data or {}).get(key)
+        return data if isinstance(data, list) else None
+    best = None
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list) and node:
+            if isinstance(node[0], dict):
+                if best is None or len(node) > len(best): best = node
+            else:
+                stack.extend(node)
+    return best
+
+def _delta_frame(pairs, columns):
+    # [(행 키, 셀 목록)] -> 행 키 인덱스의 문자열 DataFrame (열 개수는 columns 에 맞춤)
+    width = len(columns)
+    pairs = list(pairs)
+    rows = [(list(cells) + [""] * width)[:width] for _, cells in pairs]
+    return pd.DataFrame(rows, index=[k for k, _ in pairs], columns=columns, dtype=object)
+
+def _apply_table_delta(frame, delta):
+    # 감시 변경분 적용 -> (갱신된 frame, 새로 생기거나 바뀐 행). 바뀐 행은 제자리, 새 행은 끝에
+    frame = frame.drop(delta.get("removed") or [], errors="ignore")
+    updated = _delta_frame(delta.get("updated") or [], frame.columns)
+    inserted = _delta_frame(delta.get("inserted") or [], frame.columns)
+    if len(updated):
+        updated = updated[updated.index.isin(frame.index)]
+        frame.loc[updated.index] = updated.to_numpy()
+    if len(inserted): frame = pd.concat([frame, inserted])
+    return frame, pd.concat([updated, inserted])
+
+class _ExportWorker:
+    # 엑셀 저장 전용 스레드. 스크래핑 쪽은 submit 후 바로 다음 작업으로 (큐가 차면 그때만 대기)
+    # - 같은 워크북으로 연달아 쌓인 작업은 합쳐서 한 번에 쓰기 (먼저 온 작업과 똑같은 행은 제외)
+    # - 파일이 열려 있으면(PermissionError) 간격을 늘려가며 다시 시도, retry_sec 를 넘기면 마지막으로 임시 파일 저장
+    # save(target, df, with_secondary, temp_on_locked) -> (저장 경로 | None, 상태). submit 은 그 결과의 Future 반환
+    # target 은 Tk 스레드에서 미리 읽어 둔 값(경로/시트/시작 행) -> 저장 스레드는 Tk 변수를 읽지 않음
+    # 작업 묶음이 실패하면 그 Future 들은 예외로 끝나고 스레드는 다음 작업을 계속 처리 (Future 가 영원히 대기하는 일 없음)
+    RETRY_DELAYS = (2, 5, 10, 30, 60)
+    CLOSE = object()  # 종료 표시 (carry 의 '비어 있음' None 과 구분)
+
+    def __init__(self, save, log, maxsize=4, retry_sec=600):
+        self.save = save
+        self.log = log
+        self.retry_sec = retry_sec
+        self.jobs = queue.Queue(maxsize=max(1, maxsize))
+        self.carry = None
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="export-worker", daemon=True)
+        self.thread.start()
+
+    def submit(self, target, df, with_secondary=True):
+        future = Future()
+        self.jobs.put((target, df, with_secondary, future))
+        return future
+
+    def close(self, timeout=None):
+        # 남은 작업을 모두 쓴 뒤 종료
+        # timeout 을 주면 재시도 대기를 끊고(잠긴 파일은 바로 임시 저장) 그 시간까지만 기다림 -> 창 닫기가 멈추지 않음
+        if not self.thread.is_alive(): return
+        if timeout is not None: self.stop.set()
+        try: self.jobs.put(self.CLOSE, timeout=timeout)
+        except queue.Full: return
+        self.thread.join(timeout)
+
+    def _take(self, batch):
+        # batch[0] 뒤로 이미 큐에 있는 같은 워크북/같은 열 작업을 batch 에 이어 붙임. 다른 작업을 만나면 다음 차례로 남겨둠
+        first = batch[0]
+        while self.carry is None:
+            try: job = self.jobs.get_nowait()
+            except queue.Empty: break
+            if job is self.CLOSE or job[0] != first[0] or not job[1].columns.equals(first[1].columns): self.carry = job
+            else: batch.append(job)
+
+    def _run(self):
+        while True:
+            job, self.carry = (self.carry, None) if self.carry is not None else (self.jobs.get(), None)
+            if job is self.CLOSE: return
+            batch, result, error = [job], None, None
+            try:
+                self._take(batch)
+                result = self._write(batch)
+            except Exception as e:
+                error = e
+                try: self.log(f"❌ 저장 작업 실패: {e}", "ERROR")
+                except Exception: pass
+            finally:
+                for *_, future in batch:
+                    if future.done(): continue
+                    if error is None and result is not None: future.set_result(result)
+                    else: future.set_exception(error or RuntimeError("저장 작업 중단"))
+
+    @staticmethod
+    def _merge(frames):
+        if len(frames) == 1: return frames[0]
+        seen, parts = None, []
+        for df in frames:
+            rows = _ExportState.row_hashes(df)[1]
+            if seen is not None: df = df[~np.isin(rows, seen)]
+            seen = rows if seen is None else np.concatenate([seen, rows])
+            parts.append(df)
+        return pd.concat(parts, ignore_index=True)
+
+    def _write(self, batch):
+        deadline = time.monotonic() + self.retry_sec
+        attempt = 0
+        while True:
+            if len(batch) > 1: self.log(f"📦 저장 작업 {len(batch)}건을 한 번에 기록", "DETAIL")
+            df = self._merge([job[1] for job in batch])
+            with_secondary = any(job[2] for job in batch)
+            last = self.stop.is_set() or time.monotonic() >= deadline
+            try: return self.save(batch[0][0], df, with_secondary, last)
+            except PermissionError:
+                delay = self.RETRY_DELAYS[min(attempt, len(self.RETRY_DELAYS) - 1)]
+                delay = max(0, min(delay, deadline - time.monotonic()))
+                attempt += 1
+                self.log(f"🔒 파일이 열려 있음 -> {delay:.0f}초 후 다시 시도 ({attempt}회째)", "WARNING")
+                self.stop.wait(delay)
+                # 기다리는 동안 들어온 같은 워크북 작업도 이번 기록에 합침
+                if self.carry is None: self._take(batch)
+
+def _cell_hashes(col):
+    # 변경 감지용 값 단위 해시 (uint64, 열 타입과 무관). 빈 값은 0
+    # 같은 값이 한 번은 int8/datetime 열로, 다른 번에는 "-" 같은 값 때문에 문자열 열로 정리돼도 같은 해시:
+    #   숫자 / 숫자 문자열(천 단위 콤마 포함, 15자 이하) -> float64 값, 날짜 / 날짜 문자열 -> ns 정수, 그 외 -> 앞뒤 공백을 뺀 문자열
+    hash_array = pd.util.hash_array
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codes = col.cat.codes.to_numpy()
+        h = _cell_hashes(pd.Series(col.cat.categories.astype(object)))[codes]
+        h[codes < 0] = 0
+        return h
+    if pd.api.types.is_bool_dtype(col): return hash_array(col.astype(str).to_numpy(dtype=object))
+    if pd.api.types.is_datetime64_any_dtype(col):
+        when = col.to_numpy(dtype="datetime64[ns]")
+        h = hash_array(when.view(np.int64))
+        h[np.isnat(when)] = 0
+        return h
+    if pd.api.types.is_numeric_dtype(col):
+        values = col.to_numpy(dtype="float64", na_value=np.nan)
+        h = hash_array(values)
+        h[np.isnan(values)] = 0
+        return h
+    text = col.astype("string").str.strip()
+    h = hash_array(text.fillna("").to_numpy(dtype=object))
+    h[~(text.notna() & (text != "")).to_numpy(dtype=bool)] = 0
+    numbers = pd.to_numeric(text.str.replace(",", "", regex=False).where(text.str.len() <= 15), errors="coerce")
+    hit = numbers.notna().to_numpy(dtype=bool)
+    if hit.any(): h[hit] = hash_array(numbers.to_numpy(dtype="float64", na_value=np.nan)[hit])
+    dates = text.str.fullmatch(_DATETIME_RE).fillna(False).to_numpy(dtype=bool) & ~hit
+    if dates.any():
+        when = pd.to_datetime(text[dates], errors="coerce", format="ISO8601").to_numpy(dtype="datetime64[ns]")
+        h[dates] = np.where(np.isnat(when), h[dates], hash_array(when.view(np.int64)))
+    return h
+
+def _canonical_frame(df):
+    # 열마다 _cell_hashes -> 행 해시는 이 프레임을 pandas 로 한 번 더 해시
+    return pd.DataFrame({i: _cell_hashes(df.iloc[:, i]) for i in range(df.shape[1])}, index=df.index)
+
+class _ExportState:
+    # 워크북 옆 *_state.json: 시트별 마지막 저장 테이블 해시 + 요약 누계 (크기는 행 수와 무관)
+    # 이미 쓴 행의 (키 해시, 행 해시) 는 *_state.keys 에 int64 (시트, 키, 행) 으로 이어 붙이기만 함 -> 저장마다 새 행/바뀐 행만큼만 씀
+    # 키는 최근 MAX_KEYS 개만 기억: 파일이 그 두 배를 넘으면 최근 것만 남겨 다시 씀 (아주 오래된 행이 다시 나오면 한 번 더 기록)
+    # 워크북이 밖에서 바뀌었으면(수정 시각/크기 불일치) 기록을 버리고 처음부터 다시 쌓음
+    MAX_KEYS = 200_000
+
+    def __init__(self, path, workbook_path):
+        self.path = path
+        self.keys_path = os.path.splitext(path)[0] + ".keys"
+        self.workbook_path = workbook_path
+        try:
+            with open(path, encoding="utf-8") as f: self.data = json.load(f)
+        except (OSError, ValueError): self.data = {}
+        stale = not self.data.get("workbook") or self.data["workbook"] != self._stat()
+        if stale: self.data = {}
+        self.data.setdefault("sheets", {})
+        self.log = np.zeros((0, 3), dtype=np.int64)
+        if not stale:
+            try: raw = np.fromfile(self.keys_path, dtype=np.int64)
+            except OSError: raw = self.log.ravel()
+            self.log = raw[:len(raw) // 3 * 3].reshape(-1, 3)
+        self.pending = []
+        self.rewrite = stale and os.path.exists(self.keys_path)
+        # 예전 형식(JSON 안의 keys/rows 목록) -> 다음 save 때 .keys 로 옮김
+        for sheet, entry in self.data["sheets"].items():
+            if "keys" in entry:
+                self._add(sheet, np.asarray(entry.pop("keys"), dtype=np.int64), np.asarray(entry.pop("rows"), dtype=np.int64))
+                self.rewrite = True
+
+    @staticmethod
+    def _sheet_id(sheet):
+        return int.from_bytes(hashlib.sha1(str(sheet).encode("utf-8")).digest()[:8], "little", signed=True)
+
+    def _add(self, sheet, keys, rows):
+        self.pending.append(np.column_stack([np.full(len(keys), self._sheet_id(sheet), dtype=np.int64), keys, rows]))
+
+    def _known(self, sheet):
+        # 이 시트의 (키, 행) 기록, 같은 키는 마지막 값
+        log = np.concatenate([self.log] + self.pending) if self.pending else self.log
+        log = log[log[:, 0] == self._sheet_id(sheet)]
+        prev = pd.Series(log[:, 2], index=log[:, 1])
+        return prev[~prev.index.duplicated(keep="last")]
+
+    def _stat(self):
+        try: st = os.stat(self.workbook_path)
+        except OSError: return None
+        return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+    @staticmethod
+    def row_hashes(df, key_cols=None):
+        # (키 해시, 행 해시) int64 배열. 키 열이 없으면 행 전체가 키
+        # 타입 정리 결과(정수 폭, 빈 칸으로 인한 float64, 숫자/날짜 열이 문자열로 남음)가 달라도 같은 값이면 같은 해시 (_canonical_frame)
+        canon = _canonical_frame(df)
+        rows = pd.util.hash_pandas_object(canon, index=False).to_numpy().view(np.int64)
+        if not key_cols: return rows, rows
+        positions = [df.columns.get_loc(c) for c in key_cols]
+        keys = pd.util.hash_pandas_object(canon[positions], index=False).to_numpy().view(np.int64)
+        return keys, rows
+
+    @staticmethod
+    def table_hash(df, rows):
+        digest = hashlib.sha1(json.dumps([str(c) for c in df.columns], ensure_ascii=False).encode("utf-8"))
+        digest.update(rows.tobytes())
+        return digest.hexdigest()
+
+    def unchanged(self, sheet, table_hash):
+        return self.data["sheets"].get(sheet, {}).get("table") == table_hash
+
+    def changed_mask(self, sheet, keys, rows):
+        # 처음 보는 키이거나 내용이 바뀐 행만 True
+        prev = self._known(sheet)
+        if prev.empty: return np.ones(len(rows), dtype=bool)
+        old = prev.reindex(keys)
+        return old.isna().to_numpy() | (old.to_numpy() != rows)
+
+    def summary(self, sheet):
+        # 보조 시트 요약 누계 (없으면 None)
+        saved = self.data["sheets"].get(sheet, {}).get("summary")
+        return pd.DataFrame(saved["data"], columns=saved["columns"]) if saved else None
+
+    def set_summary(self, sheet, summary):
+        split = summary.to_dict("split")
+        self.data["sheets"].setdefault(sheet, {})["summary"] = {"columns": [str(c) for c in split["columns"]], "data": split["data"]}
+
+    def update(self, sheet, table_hash, keys, rows):
+        # 기록이 없거나 바뀐 (키, 행) 만 추가
+        self.data["sheets"].setdefault(sheet, {})["table"] = table_hash
+        new = self.changed_mask(sheet, keys, rows)
+        if new.any(): self._add(sheet, keys[new], rows[new])
+
+    def _save_keys(self):
+        log = np.concatenate([self.log] + self.pending) if self.pending else self.log
+        if self.rewrite or len(log) > 2 * self.MAX_KEYS:
+            # 압축: (시트, 키) 마다 마지막 값만, 그중 최근 MAX_KEYS 개
+            log = log[~pd.DataFrame(log[:, :2]).duplicated(keep="last").to_numpy()][-self.MAX_KEYS:]
+            tmp = self.keys_path + ".tmp"
+            log.tofile(tmp)
+            os.replace(tmp, self.keys_path)
+        elif self.pending:
+            with open(self.keys_path, "ab") as f: f.write(np.concatenate(self.pending).tobytes())
+        self.log, self.pending, self.rewrite = log, [], False
+
+    def save(self):
+        self.data["workbook"] = self._stat()
+        tmp = self.path + ".tmp"
+        try:
+            self._save_keys()
+            with open(tmp, "w", encoding="utf-8") as f: json.dump(self.data, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+def _typed_for_store(df):
+    # 이력 저장용: 이미 _normalize_frame 을 거친 프레임의 타입 그대로, 섞인 object 열만 문자열로 (Parquet 는 열마다 타입 하나)
+    # 열만 모아 새 프레임으로 (데이터 복사 없음, 넘겨받은 프레임은 그대로 둠)
+    cols = [df.iloc[:, i] for i in range(df.shape[1])]
+    out = pd.DataFrame({i: col.astype("string") if pd.api.types.is_object_dtype(col) else col for i, col in enumerate(cols)}, copy=False)
+    out.columns = [str(c) for c in df.columns]
+    return out
+
+class _HistoryStore:
+    # 저장한 테이블 이력 (추가 전용): <root>/date=YYYY-MM-DD/center=XXX/<run_id>.parquet
+    # 열 타입 유지 + run_id / scraped_at 열. pyarrow 가 없으면 같은 구조에 .pkl 로 저장 (조회는 둘 다 읽음)
+    def __init__(self, root, center_col="센터"):
+        self.root = root
+        self.center_col = center_col
+        try:
+            import pyarrow  # noqa: F401
+            self.ext = ".parquet"
+        except ImportError:
+            self.ext = ".pkl"
+
+    def append(self, df, run_id, when=None):
+        when = when or datetime.now()
+        df = _typed_for_store(df)
+        df.insert(0, "run_id", run_id)
+        df.insert(1, "scraped_at", pd.Timestamp(when))
+        if self.center_col in df.columns: centers = df[self.center_col].astype(str)
+        else: centers = pd.Series("all", index=df.index)
+        written = []
+        for center, part in df.groupby(centers, sort=False):
+            folder = os.path.join(self.root, f"date={when:%Y-%m-%d}", "center=" + re.sub(r'[\\/:*?"<>|=]', "_", center))
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, run_id + self.ext)
+            for n in itertools.count(1):
+                if not os.path.exists(path): break
+                path = os.path.join(folder, f"{run_id}-{n}{self.ext}")
+            tmp = path + ".tmp"
+            if self.ext == ".parquet": part.to_parquet(tmp, engine="pyarrow", index=False)
+            else: part.to_pickle(tmp, compression=None)
+            os.replace(tmp, path)
+            written.append(path)
+        return written
+
+    def load(self, start, end=None, centers=None, columns=None):
+        # 날짜 범위(YYYY-MM-DD, 양끝 포함) + 센터 목록으로 필요한 파티션만 읽음
+        start = str(start)[:10]
+        end = str(end or start)[:10]
+        frames = []
+        days = sorted(os.listdir(self.root)) if os.path.isdir(self.root) else []
+        for day_dir in days:
+            if not day_dir.startswith("date=") or not start <= day_dir[5:] <= end: continue
+            day_path = os.path.join(self.root, day_dir)
+            for center_dir in sorted(os.listdir(day_path)):
+                if centers and center_dir[7:] not in centers: continue
+                center_path = os.path.join(day_path, center_dir)
+                for name in sorted(os.listdir(center_path)):
+                    path = os.path.join(center_path, name)
+                    if name.endswith(".parquet"): frames.append(pd.read_parquet(path, columns=columns))
+                    elif name.endswith(".pkl"):
+                        part = pd.read_pickle(path)
+                        frames.append(part[columns] if columns else part)
+        if not frames: return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True)
+        return df.sort_values("scraped_at", kind="stable", ignore_index=True) if "scraped_at" in df.columns else df
+
+    def to_workbook(self, path, start, end=None, sheet="이력"):
+        # 이력 구간을 새 워크북 한 시트로 (엑셀 원본을 다시 읽지 않고 보기용 파일 재구성)
+        df = self.load(start, end)
+        if df.empty: return 0
+        with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
+            ws = writer.book.add_worksheet(sheet)
+            head = writer.book.add_format({"bold": True, "align": "center"})
+            ws.write_row(0, 0, [str(c) for c in df.columns], head)
+            _write_frame_xlsxwriter(ws, 1, df, writer.book.add_format({"align": "center"}))
+        return len(df)
+
+def load_history(root, start, end=None, centers=None, columns=None):
+    # 이력 조회: load_history("dsadsa_history", "2025-11-01", "2025-11-30", centers=["INC4"])
+    _ensure_heavy_imports()
+    return _HistoryStore(root).load(start, end, centers, columns)
+
+class _RunRecorder:
+    # 실행 1회 단위 계측: 단계별 시간, WebDriver 왕복 수, 재시도/대체 경로/시간 초과 횟수
+    COUNTERS = ("round_trips", "retries", "fallbacks", "timeouts")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.run_id = None
+        self.steps = []
+        self.untracked_round_trips = 0
+
+    @property
+    def active(self):
+        return self.run_id is not None
+
+    def begin(self):
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.started_at = datetime.now()
+        self.t0 = time.perf_counter()
+        self.steps = []
+        self.untracked_round_trips = 0
+
+    @contextlib.contextmanager
+    def step(self, name, **extra):
+        record = {"name": name, "sec": 0.0, "ok": True, **{k: 0 for k in self.COUNTERS}, **extra}
+        stack = self.local.__dict__.setdefault("stack", [])
+        stack.append(record)
+        t0 = time.perf_counter()
+        try:
+            yield record
+        except Exception:
+            record["ok"] = False
+            raise
+        finally:
+            record["sec"] = round(time.perf_counter() - t0, 4)
+            stack.pop()
+            if stack:
+                for key in self.COUNTERS: stack[-1][key] += record[key]
+            if self.active:
+                with self.lock: self.steps.append(record)
+
+    def count(self, key, n=1):
+        stack = getattr(self.local, "stack", None)
+        if stack: stack[-1][key] += n
+        elif key == "round_trips": self.untracked_round_trips += n
+
+    def finish(self, status, path):
+        # JSON 한 줄로 기록하고 레코드 반환
+        if not self.active: return None
+        with self.lock:
+            record = {
+                "run_id": self.run_id,
+                "started": self.started_at.isoformat(timespec="seconds"),
+                "status": status,
+                "total_sec": round(time.perf_counter() - self.t0, 3),
+                "untracked_round_trips": self.untracked_round_trips,
+                "steps": list(self.steps),
+            }
+            self.run_id = None
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+        return record
+
+def _instrument_driver(driver, recorder):
+    # 모든 WebDriver 명령은 driver.execute 를 지나므로 여기서 왕복 수를 센다
+    if getattr(driver, "zxc_instrumented", False): return driver
+    original = driver.execute
+    def execute(driver_command, params=None):
+        recorder.count("round_trips")
+        return original(driver_command, params)
+    driver.execute = execute
+    driver.zxc_instrumented = True
+    return driver
+
+class _LocatorCache:
+    # 단계별 후보 XPath 의 성공/실패/소요 시간 기록 (JSON). 지난번에 성공한 빠른 후보부터 시도
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.dirty = False
+        try:
+            with open(path, encoding="utf-8") as f: self.data = json.load(f)
+        except (OSError, ValueError): self.data = {}
+
+    def rank(self, step, candidates):
+        stats = self.data.get(step, {})
+        def key(item):
+            order, xpath = item
+            st = stats.get(xpath)
+            if st is None: return (1, order)
+            return (0, st["ms"]) if st["last_ok"] else (2, order)
+        return [xpath for _, xpath in sorted(enumerate(candidates), key=key)]
+
+    def record(self, step, xpath, ok, sec):
+        with self.lock:
+            st = self.data.setdefault(step, {}).setdefault(xpath, {"ok": 0, "fail": 0, "ms": 0.0})
+            st["ok" if ok else "fail"] += 1
+            if ok:
+                ms = sec * 1000
+                st["ms"] = round(ms if st["ok"] == 1 else st["ms"] * 0.7 + ms * 0.3, 1)
+            st["last_ok"] = ok
+            st["at"] = datetime.now().isoformat(timespec="seconds")
+            self.dirty = True
+
+    def observe(self, step, sec, ok=True):
+        # 단계 전체(동작 + 완료 조건) 소요 시간의 평균/편차 (TCP 재전송 타이머와 같은 이동 평균). "~latency" 아래에 저장
+        # 실패(동작 자체가 안 됨)는 시간 대신 연속 실패 횟수(miss)만 기록 -> 다음 실행에서 대기 한도/재시도를 줄이는 데 사용
+        with self.lock:
+            st = self.data.setdefault("~latency", {}).get(step) or {"avg": None, "dev": None, "n": 0, "miss": 0}
+            if not ok:
+                st["miss"] = st.get("miss", 0) + 1
+            else:
+                if st["avg"] is None: st.update(avg=sec, dev=sec / 2)
+                else:
+                    st["dev"] = st["dev"] * 0.75 + abs(sec - st["avg"]) * 0.25
+                    st["avg"] = st["avg"] * 0.875 + sec * 0.125
+                st.update(avg=round(st["avg"], 4), dev=round(st["dev"], 4), n=st["n"] + 1, miss=0)
+            self.data["~latency"][step] = st
+            self.dirty = True
+
+    def latency(self, step):
+        return self.data.get("~latency", {}).get(step)
+
+    def save(self):
+        with self.lock:
+            if not self.dirty: return
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f: json.dump(self.data, f, ensure_ascii=False, indent=1)
+                os.replace(tmp, self.path)
+                self.dirty = False
+            except OSError:
+                pass
+
+class _StepAborted(Exception):
+    # 필수 단계(critical) 실패: 잘못 필터된 테이블을 저장하지 않도록 이번 실행을 중단
+    pass
+
+class _SessionPool:
+    # 최대 size 개의 브라우저 세션을 빌려주는 풀. 첫 세션은 이미 로그인된 메인 드라이버
+    def __init__(self, primary, size, factory):
+        self.size = size
+        self.factory = factory
+        self.count = 1
+        self.created = []
+        self.idle = queue.Queue()
+        self.idle.put(primary)
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        try: return self.idle.get_nowait()
+        except queue.Empty: pass
+        with self.lock:
+            grow = self.count < self.size
+            if grow: self.count += 1
+        if grow:
+            try:
+                driver = self.factory()
+                with self.lock: self.created.append(driver)
+                return driver
+            except Exception:
+                with self.lock: self.count -= 1
+        return self.idle.get()
+
+    def release(self, driver):
+        self.idle.put(driver)
+
+    def close(self):
+        # 메인 드라이버는 두고 새로 만든 세션만 종료
+        for driver in self.created:
+            try: driver.quit()
+            except Exception: pass
+            shutil.rmtree(getattr(driver, "zxc_profile_dir", ""), ignore_errors=True)
+        self.created = []
 
 class WebScraperApp:
     
-    def _load_settings(self):
+    def _load_settings(self, path="setting.txt"):
         settings = {}
         try:
-            with open("setting.txt", 'r', encoding='utf-8') as f:
+            with open(path, 'r', encoding='utf-8') as f:
                 for line in f:
                     line = line.strip()
                     if line and '=' in line:
@@ -50,11 +1251,56 @@ class WebScraperApp:
         self.style.configure('Red.TButton', font=('Malgun Gothic', 9), background='#dc3545', foreground='white')
         self.style.map('Red.TButton', background=[('active', '#c82333')])
 
+        self._init_state(self._load_settings(), tk.StringVar)
+
+        main_frame = ttk.Frame(master, padding="15")
+        main_frame.pack(fill='both', expand=True)
+
+        self._create_setting_section(main_frame, "크롬 프로필 설정", [
+            ("User Data Path:", self.user_data_path),
+            ("Profile Directory:", self.profile_dir),
+            ("Target URL:", self.target_url)
+        ])
+        
+        self._create_excel_section(main_frame)
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(pady=10, fill='x')
+        
+        self.main_button = ttk.Button(button_frame, text="1. 시작하기", style='Blue.TButton', command=self.run_open_browser_and_scrape_thread)
+        self.main_button.pack(side='left', fill='x', expand=True, padx=5)
+        
+        self.watch_button = ttk.Button(button_frame, text="👁 실시간 감시", style='Green.TButton', command=self.toggle_watch)
+        self.watch_button.pack(side='left', fill='x', expand=True, padx=5)
+
+        self.quit_button = ttk.Button(button_frame, text="2. 프로그램 종료", style='Red.TButton', command=self.on_closing)
+        self.quit_button.pack(side='right', fill='x', expand=True, padx=5)
+
+        self._create_log_section(main_frame) 
+        self.master.after(LOG_FLUSH_MS, self._drain_log_queue)
+        self.update_log("프로그램 준비 완료.", "INFO")
+
+    def _init_state(self, settings, make_var):
+        # GUI 와 헤드리스 실행이 공유하는 상태/설정 (make_var: tk.StringVar 또는 _PlainVar)
         self.driver = None
         self.all_tables = []
         self.current_table_index = 0 
         self.selection_window = None 
         self.log_text = None 
+        self._log_queue = queue.SimpleQueue()
+        self.last_step_report = []
+        self._step_wait_sec = 0.0
+        self._last_locator = None
+        self._step_timeout = 1.0
+        self._watch_stop = None
+        self.recorder = _RunRecorder()
+        # 단계 타입 -> 메서드 이름 (세션별 복사본에서도 자기 driver 로 실행되도록 이름으로 보관)
+        self.step_handlers = {
+            "custom": "_step_custom",
+            "button": "_step_button",
+            "time_filter": "_step_time_filter",
+            "batch_select": "_step_batch_select",
+        }
         
         # =========================================================================
         # 🛠️ [사용자 설정 구간] - 물류센터 설정 적용 완료
@@ -69,90 +1315,80 @@ class WebScraperApp:
         self.dropdown_settings = [
             
             # 1. 날짜 선택 (달력 열기 -> 오늘 날짜 클릭)
+            # critical: 실패하면 필터가 틀린 테이블이 나오므로 실행 중단 (나머지는 실패해도 [패스])
             {
-                "type": "button", "name": "달력 열기",
-                "xpath": "//*[@id='searchForm']/div/div[1]/div[1]/div[2]/div/div[1]/button/div"
+                "type": "button", "name": "달력 열기", "critical": True,
+                "xpath": "//*[@id='searchForm']/div/div[1]/div[1]/div[2]/div/div[1]/button/div",
+                "wait": {"until": "visible", "xpath": f"//td[contains(text(), '{today_day}')] | //a[contains(text(), '{today_day}')]"}
             },
             {
-                "type": "button", "name": f"오늘 날짜({today_day}일) 선택",
-                "xpath": f"//td[contains(text(), '{today_day}')] | //a[contains(text(), '{today_day}')]"
+                "type": "button", "name": f"오늘 날짜({today_day}일) 선택", "critical": True,
+                "xpath": f"//td[contains(text(), '{today_day}')] | //a[contains(text(), '{today_day}')]",
+                "wait": {"until": "dom_quiet", "quiet_ms": 100}
             },
 
             # 2. 센터 선택 (Custom: 열기 -> 텍스트 클릭)
             {
                 "type": "custom", 
-                "name": "센터 선택",
+                "name": "센터 선택", "critical": True,
                 "open_xpath": "//*[@id='centerIdListContainer']/div/div/button",
                 "option_xpath": "//ul//li//a[contains(., '{}')]", 
-                "value": "INC4"
+                "value": "INC4",
+                "batch": True,
+                # 센터가 바뀌면 캠프 목록을 다시 불러오므로 통신 종료까지 대기
+                "wait": {"until": "network_idle", "quiet_ms": 200}
             },
 
             # 3. 캠프 선택 (Select All)
             {
                 "type": "button", "name": "캠프 드랍다운 열기",
-                "xpath": "//*[@id='campCodeListContainer']/div/div/button/div/div"
+                "xpath": "//*[@id='campCodeListContainer']/div/div/button/div/div",
+                "wait": {"until": "visible", "xpath": "//*[@id='campCodeListContainer']/div/div/div/div[2]/div/button[1]"}
             },
             {
                 "type": "button", "name": "캠프 Select All 클릭",
-                "xpath": "//*[@id='campCodeListContainer']/div/div/div/div[2]/div/button[1]"
+                "xpath": "//*[@id='campCodeListContainer']/div/div/div/div[2]/div/button[1]",
+                "wait": {"until": "dom_quiet", "quiet_ms": 100}
             },
 
             # 4. 정기배송 (Select All)
             {
                 "type": "button", "name": "정기배송 드랍다운 열기",
-                "xpath": "//*[@id='searchForm']/div/div[1]/div[2]/div[2]/div/div/button"
+                "xpath": "//*[@id='searchForm']/div/div[1]/div[2]/div[2]/div/div/button",
+                "wait": {"until": "visible", "xpath": "//*[@id='searchForm']/div/div[1]/div[2]/div[2]/div/div/div/div[1]/div/button[1]"}
             },
             {
                 "type": "button", "name": "정기배송 Select All 클릭",
-                "xpath": "//*[@id='searchForm']/div/div[1]/div[2]/div[2]/div/div/div/div[1]/div/button[1]"
+                "xpath": "//*[@id='searchForm']/div/div[1]/div[2]/div[2]/div/div/div/div[1]/div/button[1]",
+                "wait": {"until": "dom_quiet", "quiet_ms": 100}
             },
 
             # 5. 배송유형 (Select All)
             {
                 "type": "button", "name": "배송유형 드랍다운 열기",
-                "xpath": "//*[@id='searchForm']/div/div[1]/div[2]/div[1]/div/div[1]/button"
-            },
-
-            # ======================================
-            {
-                "type": "button", 
-                "name": "TEST 1. 사용자 원본 경로",
-                "xpath": "//*[@id='searchForm']/div/div[1]/div[2]/div[1]/div/div[1]/div/button[1]"
+                "xpath": "//*[@id='searchForm']/div/div[1]/div[2]/div[1]/div/div[1]/button",
+                "wait": {"until": "visible", "xpath": "//*[@id='searchForm']/div/div[1]/div[2]/div[1]/div/div[1]/button/following-sibling::div"}
             },
 
-            # [테스트 2] 화면상 'Select All' 글자가 있는 2번째 버튼
+            # xpath 후보 목록: 지난 실행에서 성공한 후보부터 시도, 실패할 때만 나머지 중 보이는 것 클릭
             {
-                "type": "button", 
-                "name": "TEST 2. 2번째 Select All 버튼",
-                "xpath": "(//button[contains(., 'Select All')])[2]"
+                "type": "button", "name": "배송유형 Select All 클릭",
+                "xpath": [
+                    "//*[@id='searchForm']/div/div[1]/div[2]/div[1]/div/div[1]/button/following-sibling::div//button[1]",
+                    "//*[@id='searchForm']/div/div[1]/div[2]/div[1]/div/div[1]/div/button[1]",
+                    "//div[contains(@class, 'show')]//button[contains(., 'Select All')]",
+                    "(//button[contains(., 'Select All')])[last()]",
+                    "(//button[contains(., 'Select All')])[2]",
+                ],
+                "wait": {"until": "dom_quiet", "quiet_ms": 100}
             },
 
-            # [테스트 3] 'Select All' 글자가 있는 마지막 버튼 (가장 최근에 뜬거)
-            {
-                "type": "button", 
-                "name": "TEST 3. 마지막 Select All 버튼",
-                "xpath": "(//button[contains(., 'Select All')])[last()]"
-            },
-
-            # [테스트 4] 현재 열려있는(show) 메뉴 안의 버튼
-            {
-                "type": "button", 
-                "name": "TEST 4. 열린 메뉴(show) 안의 버튼",
-                "xpath": "//div[contains(@class, 'show')]//button[contains(., 'Select All')]"
-            },
 
-            # [테스트 5] 열기 버튼 바로 옆(형제) 박스 안의 버튼 (추천)
             {
-                "type": "button", 
-                "name": "TEST 5. 형제 요소(following-sibling)",
-                "xpath": "//*[@id='searchForm']/div/div[1]/div[2]/div[1]/div/div[1]/button/following-sibling::div//button[1]"
-            },
-            #==============================================================
-
-            {
-                "type": "time_filter", "name": "ExSD (11시 이후 선택)",
+                "type": "time_filter", "name": "ExSD (11시 이후 선택)", "critical": True,
                 "open_xpath": "//*[@id='searchForm']/div/div[1]/div[2]/div[3]/div/div[1]/button",
-                "start_hour": 11
+                "start_hour": 11,
+                "wait": {"until": "dom_quiet", "quiet_ms": 100}
             },
 
             # 7. 단위 (Parcel 선택)
@@ -163,46 +1399,94 @@ class WebScraperApp:
                 
                 "option_xpath": "//ul//li//a[contains(., '{}')]",
                 
-                "value": "Parcel"
+                "value": "Parcel",
+                "batch": True,
+                "wait": {"until": "network_idle", "quiet_ms": 200}
             }
         ]
         # =========================================================================
 
-        settings = self._load_settings() 
+        self.file_logger, self._log_listener = _start_file_logger(settings.get('log_path', "scraper.log"))
+        # 후보 XPath 성공 기록 (다음 실행에서 성공한 후보부터 시도)
+        self.locator_cache = _LocatorCache(settings.get('locator_cache_path') or "locator_cache.json")
 
-        self.user_data_path = tk.StringVar(value=settings.get('user_data_path', r"C:\Users\rmaru\AppData\Local\Google\Chrome\Profile 2"))
-        self.profile_dir = tk.StringVar(value=settings.get('profile_dir', "Profile 2"))
+        self.user_data_path = make_var(value=settings.get('user_data_path', r"C:\Users\rmaru\AppData\Local\Google\Chrome\Profile 2"))
+        self.profile_dir = make_var(value=settings.get('profile_dir', "Profile 2"))
         # 실제 사이트 URL로 변경해주세요
-        self.target_url = tk.StringVar(value=settings.get('target_url', "https://your-logistics-site.com"))
+        self.target_url = make_var(value=settings.get('target_url', "https://your-logistics-site.com"))
         
-        self.excel_path = tk.StringVar(value=settings.get('excel_path', r"C:\Users\rmaru\OneDrive\바탕 화면\zxc\dsadsa.xlsx")) 
-        self.sheet_name = tk.StringVar(value=settings.get('primary_sheet_name', "테스트")) 
-        self.start_row = tk.StringVar(value=settings.get('primary_start_row', "34"))
-        self.secondary_sheet_name = tk.StringVar(value=settings.get('secondary_sheet_name', "테스트2")) 
-        self.secondary_start_row = tk.StringVar(value=settings.get('secondary_start_row', "60"))
+        self.excel_path = make_var(value=settings.get('excel_path', r"C:\Users\rmaru\OneDrive\바탕 화면\zxc\dsadsa.xlsx")) 
+        self.sheet_name = make_var(value=settings.get('primary_sheet_name', "테스트")) 
+        self.start_row = make_var(value=settings.get('primary_start_row', "34"))
+        self.secondary_sheet_name = make_var(value=settings.get('secondary_sheet_name', "테스트2")) 
+        self.secondary_start_row = make_var(value=settings.get('secondary_start_row', "60"))
 
-        main_frame = ttk.Frame(master, padding="15")
-        main_frame.pack(fill='both', expand=True)
+        # 브라우저 세션: 디버깅 포트의 기존 크롬에 붙고, 종료 시에도 크롬은 살려둠 (로그인 유지)
+        self.debug_port = int(settings.get('debug_port') or 9222)
+        self.keep_browser = settings.get('keep_browser', "1") not in ("0", "false", "False")
+        self.ready_xpath = settings.get('ready_xpath', "")
+        self.headless = False
+        self.table_rule = settings.get('table_rule', "largest")
 
-        self._create_setting_section(main_frame, "크롬 프로필 설정", [
-            ("User Data Path:", self.user_data_path),
-            ("Profile Directory:", self.profile_dir),
-            ("Target URL:", self.target_url)
-        ])
-        
-        self._create_excel_section(main_frame)
-        
-        button_frame = ttk.Frame(main_frame)
-        button_frame.pack(pady=10, fill='x')
-        
-        self.main_button = ttk.Button(button_frame, text="1. 시작하기", style='Blue.TButton', command=self.run_open_browser_and_scrape_thread)
-        self.main_button.pack(side='left', fill='x', expand=True, padx=5)
-        
-        self.quit_button = ttk.Button(button_frame, text="2. 프로그램 종료", style='Red.TButton', command=self.on_closing)
-        self.quit_button.pack(side='right', fill='x', expand=True, padx=5)
+        # 여러 센터(+단위/ExSD 시작 시각) 동시 추출: 값 목록의 조합마다 세션 하나씩 병렬 실행
+        time_step = next((st["name"] for st in self.dropdown_settings if st.get("type") == "time_filter"), "")
+        self.fanout_axes = []
+        for key, step, field, label in (
+            ("centers", settings.get('center_step', "센터 선택"), "value", "센터"),
+            ("units", settings.get('unit_step', "단위 (Parcel)"), "value", "단위"),
+            ("start_hours", settings.get('time_step', time_step), "start_hour", "ExSD 시작"),
+        ):
+            values = [v.strip() for v in settings.get(key, "").split(",") if v.strip()]
+            if field == "start_hour": values = [int(v) for v in values]
+            if values: self.fanout_axes.append([(label, step, field, v) for v in values])
+        self.max_sessions = max(1, int(settings.get('max_sessions') or 3))
 
-        self._create_log_section(main_frame) 
-        self.update_log("프로그램 준비 완료.", "INFO")
+        # 추출 대상 테이블 지정 (id / xpath / 헤더 글자 / 열 개수). 하나도 없으면 전체 스캔
+        self.table_target = {
+            "id": settings.get('table_id', ""),
+            "xpath": settings.get('table_xpath', ""),
+            "headers": [h.strip() for h in settings.get('table_header', "").split(",") if h.strip()],
+            "columns": int(settings.get('table_columns') or 0),
+        }
+        has_target = any(self.table_target.values())
+        self.extract_mode = settings.get('extract_mode') or ("target" if has_target else "full")
+
+        # 네트워크 캡처: 검색 API 응답(JSON)을 바로 DataFrame 으로. 못 잡으면 DOM 추출로 대체
+        self.capture_url = settings.get('capture_url', "")
+        self.capture_json_path = settings.get('capture_json_path', "")
+
+        # 변경 감지: 이 열(들)이 같은 행은 같은 행으로 보고 내용이 바뀐 경우만 다시 저장. 비우면 행 전체로 비교
+        self.export_key = [c.strip() for c in settings.get('export_key', "").split(",") if c.strip()]
+
+        # 페이지가 나뉜(또는 가상 스크롤) 결과 표: 다음 버튼 / 스크롤 컨테이너 XPath 중 하나를 주면
+        # 페이지마다 추출 -> 중복 제거 -> stream_flush_rows 행 모일 때마다 바로 저장 (대상 테이블은 table_* 설정)
+        self.page_next_xpath = settings.get('page_next_xpath', "")
+        self.page_scroll_xpath = settings.get('page_scroll_xpath', "")
+        self.page_max = int(settings.get('page_max') or 200)
+        self.stream_flush_rows = int(settings.get('stream_flush_rows') or 2000)
+        self.stream_pages = bool(self.page_next_xpath or self.page_scroll_xpath)
+
+        # 보조 시트 요약: summary_group_by 가 있으면 상단 32행 복사 대신 새 행만 집계해서 누계 블록을 씀
+        # (summary_sum 비우면 숫자 열 전체, summary_time_col 은 summary_bucket 단위 시간 구간으로 묶음)
+        self.summary_group_by = [c.strip() for c in settings.get('summary_group_by', "").split(",") if c.strip()]
+        self.summary_sum = [c.strip() for c in settings.get('summary_sum', "").split(",") if c.strip()]
+        self.summary_time_col = settings.get('summary_time_col') or "ExSD"
+        self.summary_bucket = settings.get('summary_bucket') or "1h"
+
+        # 엑셀 저장 스레드: 대기열 크기(차면 스크래핑이 잠시 대기), 파일 열림 시 재시도 한도(초)
+        self.export_worker = _ExportWorker(lambda target, df, with_secondary, last: self._save_rows(target, df, with_secondary, temp_on_locked=last),
+                                           lambda message, level="INFO": self.update_log(message, level), int(settings.get('export_queue_size') or 4), float(settings.get('export_retry_sec') or 600))
+
+        # 페이지 설정 단계: 실패 시 재시도 횟수, 대기 한도 상한(초). 첫 대기 한도는 지난 실행의 소요 시간에서 학습
+        self.step_retries = int(settings.get('step_retries') or 2)
+        self.step_timeout_max = float(settings.get('step_timeout_max') or 15)
+
+        # 실시간 감시 폴링 간격(초)
+        self.watch_interval = float(settings.get('watch_interval') or 5)
+
+        # 이력 저장소 (날짜/센터별 Parquet). 비우면 워크북 옆 <이름>_history 폴더
+        self.history_dir = settings.get('history_dir') or os.path.splitext(self.excel_path.get())[0] + "_history"
+        self.history_center_col = settings.get('history_center_col') or "센터"
 
     def _create_setting_section(self, parent, title, fields):
         labelframe = ttk.LabelFrame(parent, text=title, padding="10")
@@ -242,14 +1526,29 @@ class WebScraperApp:
         self.log_text.tag_config("DETAIL", foreground="#87cefa")
 
     def update_log(self, message, level="INFO"):
-        if self.log_text is None: return 
-        timestamp = datetime.now().strftime("[%H:%M:%S]")
-        full_msg = f"{timestamp} {message}\n"
-        self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, full_msg, level)
-        self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
-        self.master.update_idletasks()
+        # 어느 스레드에서 불러도 안전: 큐에 넣기만 하고 바로 반환
+        now = datetime.now()
+        self._log_queue.put((now, level, message))
+        self.file_logger.log(_LOG_LEVELS.get(level, logging.INFO), message)
+
+    def _drain_log_queue(self):
+        # Tk 메인 루프에서 LOG_FLUSH_MS 마다 모아서 한 번에 출력
+        batch = []
+        try:
+            while len(batch) < LOG_BATCH_MAX:
+                batch.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch and self.log_text is not None:
+            self.log_text.config(state='normal')
+            for ts, level, message in batch:
+                self.log_text.insert(tk.END, f"{ts.strftime('[%H:%M:%S]')} {message}\n", level)
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > LOG_MAX_LINES:
+                self.log_text.delete('1.0', f'{line_count - LOG_MAX_LINES + 1}.0')
+            self.log_text.see(tk.END)
+            self.log_text.config(state='disabled')
+        self.master.after(LOG_FLUSH_MS, self._drain_log_queue)
 
     def browse_excel_path(self):
         filename = filedialog.askopenfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")])
@@ -257,10 +1556,17 @@ class WebScraperApp:
 
     def on_closing(self):
         self.update_log("프로그램 종료.", "WARNING")
+        if self._watch_stop is not None: self._watch_stop.set()
+        self.export_worker.close(timeout=EXPORT_CLOSE_SEC)
+        if self.recorder.active: self._finish_run("closed")
         if self.driver:
-            try: self.driver.quit()
+            try:
+                # 크롬은 살려두고 chromedriver 만 종료 -> 다음 실행 때 디버깅 포트로 바로 연결
+                if self.keep_browser: self.driver.service.stop()
+                else: self.driver.quit()
             except: pass
         if self.selection_window: self.selection_window.destroy()
+        if self._log_listener: self._log_listener.stop()
         self.master.destroy()
 
     def run_open_browser_and_scrape_thread(self):
@@ -269,43 +1575,129 @@ class WebScraperApp:
 
     def _integrated_workflow(self):
         self.update_log("--- 작업 시작 ---", "INFO")
-        self.open_browser()
+        _ensure_heavy_imports()
+        self._begin_run()
+        with self.recorder.step("브라우저 준비"):
+            self.open_browser()
         if not self.driver:
+            self._finish_run("browser_error")
             self.main_button.config(state='normal', text="1. 시작하기")
             return
 
-        user_response = messagebox.askokcancel("준비", "로그인 후 원하는 페이지에서 [확인]을 눌러주세요.")
+        if self._page_ready():
+            self.update_log("✅ 로그인 상태 확인 -> 바로 진행", "SUCCESS")
+            user_response = True
+        else:
+            user_response = messagebox.askokcancel("준비", "로그인 후 원하는 페이지에서 [확인]을 눌러주세요.")
         if not user_response:
+            self._finish_run("cancelled")
             self.main_button.config(state='normal', text="1. 시작하기")
             return
 
-        self._configure_page_settings()
-        self.start_scraping()
+        try:
+            if self.fanout_axes:
+                self._start_fanout_scraping()
+            elif self.stream_pages:
+                self._configure_page_settings()
+                self._stream_export()
+            else:
+                self._configure_page_settings()
+                self.start_scraping()
+        except _StepAborted:
+            self._finish_run("aborted")
+            self.main_button.config(state='normal', text="1. 시작하기")
+            return
+        # 테이블이 있으면 저장(_export_table) 시점에 실행 기록 마감
+        if not self.all_tables: self._finish_run("no_table")
         self.main_button.config(state='normal', text="1. 시작하기")
     
+    def _begin_run(self):
+        if self.recorder.active: self._finish_run("abandoned")
+        self.recorder.begin()
+
+    def _finish_run(self, status, excel_path=None):
+        # 실행 기록을 워크북 옆 *_runs.jsonl 에 남기고 로그 패널에 요약 표 출력
+        # 저장 스레드에서 부를 때는 excel_path 를 넘겨서 Tk 변수를 읽지 않음
+        path = os.path.splitext(excel_path or self.excel_path.get())[0] + "_runs.jsonl"
+        record = self.recorder.finish(status, path)
+        if not record: return
+        self.update_log(f"📊 실행 요약 [{record['run_id']}] {status} / 총 {record['total_sec']:.2f}s", "INFO")
+        self.update_log(f"  {'단계':<24}{'시간':>8}{'왕복':>6}{'재시도':>6}{'대체':>6}{'초과':>6}", "DETAIL")
+        for st in record["steps"]:
+            mark = "" if st["ok"] else " ❌"
+            self.update_log(f"  {st['name'][:24]:<24}{st['sec']:>7.2f}s{st['round_trips']:>6}{st['retries']:>6}{st['fallbacks']:>6}{st['timeouts']:>6}{mark}", "DETAIL")
+
+    def _chrome_options(self):
+        options = Options()
+        options.add_argument(f"user-data-dir={self.user_data_path.get()}") 
+        options.add_argument(f"profile-directory={self.profile_dir.get()}") 
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument(f"--remote-debugging-port={self.debug_port}")
+        if self.headless: options.add_argument("--headless=new")
+        elif self.keep_browser: options.add_experimental_option("detach", True)
+        self._enable_capture_logging(options)
+        return options
+
+    def _enable_capture_logging(self, options):
+        # 네트워크 캡처용 performance 로그 (Network 이벤트만)
+        if not self.capture_url: return
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    def _attach_browser(self):
+        # 이미 떠 있는 크롬(디버깅 포트)에 연결. 프로필 로딩/로그인 생략
+        options = Options()
+        options.debugger_address = f"127.0.0.1:{self.debug_port}"
+        self._enable_capture_logging(options)
+        return webdriver.Chrome(options=options)
+
     def open_browser(self):
-        if self.driver:
+        timings = {}
+        # 1) 기존 세션 재사용 (헬스 체크 1회)
+        if self.driver and _session_healthy(self.driver):
             self.update_log("🔄 기존 브라우저 재사용", "WARNING")
+        elif self.driver:
+            self.update_log("⚠️ 기존 세션 응답 없음 -> 다시 연결", "WARNING")
+            self.driver = None
+
+        # 2) 디버깅 포트로 떠 있는 크롬에 연결
+        if not self.driver and _debug_port_alive(self.debug_port):
+            t0 = time.perf_counter()
             try:
-                self.driver.get(self.target_url.get())
+                self.driver = self._attach_browser()
+                timings["연결"] = time.perf_counter() - t0
+                self.update_log(f"🔗 실행 중인 크롬에 연결 (포트 {self.debug_port})", "SUCCESS")
+            except Exception as e:
+                self.update_log(f"⚠️ 크롬 연결 실패 -> 새로 실행 ({e})", "WARNING")
+
+        # 3) 마지막 수단: 새 크롬 실행
+        if not self.driver:
+            self.update_log("⏳ 크롬 브라우저 실행...", "WARNING")
+            t0 = time.perf_counter()
+            try:
+                self.driver = webdriver.Chrome(options=self._chrome_options())
+                timings["실행"] = time.perf_counter() - t0
+            except Exception as e:
+                self.update_log(f"❌ 브라우저 실행 오류: {e}", "ERROR")
                 return
-            except:
-                self.driver = None
-        
-        self.update_log("⏳ 크롬 브라우저 실행...", "WARNING")
+
+        t0 = time.perf_counter()
         try:
-            options = Options()
-            options.add_argument(f"user-data-dir={self.user_data_path.get()}") 
-            options.add_argument(f"profile-directory={self.profile_dir.get()}") 
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--remote-debugging-port=9222")
-
-            self.driver = webdriver.Chrome(options=options)
             self.driver.get(self.target_url.get())
+            timings["페이지 준비"] = time.perf_counter() - t0
             self.update_log("✅ 브라우저 접속 성공.", "SUCCESS")
         except Exception as e:
-            self.update_log(f"❌ 브라우저 실행 오류: {e}", "ERROR")
+            self.update_log(f"❌ 페이지 접속 오류: {e}", "ERROR")
+            self.driver = None
+            return
+        _instrument_driver(self.driver, self.recorder)
+        self.update_log("⏱️ 브라우저 준비: " + " / ".join(f"{k} {v:.2f}s" for k, v in timings.items()), "DETAIL")
+
+    def _page_ready(self):
+        # ready_xpath 가 이미 보이면 로그인된 상태로 보고 확인 창 생략
+        if not self.ready_xpath: return False
+        return self._wait_for({"until": "visible", "xpath": self.ready_xpath}, timeout=2)
 
     def _restart_scraping(self, current_window):
         if current_window: current_window.destroy()
@@ -314,13 +1706,15 @@ class WebScraperApp:
         self.update_log("🔄 재탐색 시작", "WARNING")
         self.run_open_browser_and_scrape_thread()
 
-    def _quick_click(self, by_type, xpath_value):
+    def _quick_click(self, by_type, xpath_value, timeout=None):
+        # 대기 한도는 지금 단계의 학습된 값 (_step_timeout)
         try:
-            element = WebDriverWait(self.driver, 1).until(EC.element_to_be_clickable((by_type, xpath_value)))
+            element = WebDriverWait(self.driver, timeout or self._step_timeout, poll_frequency=0.05).until(EC.element_to_be_clickable((by_type, xpath_value)))
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
             element.click()
             return True
         except:
+            self.recorder.count("fallbacks")
             try:
                 element = self.driver.find_element(by_type, xpath_value)
                 self.driver.execute_script("arguments[0].click();", element)
@@ -328,140 +1722,772 @@ class WebScraperApp:
             except:
                 return False
 
+    def _wait_for(self, cond, timeout=3):
+        # 조건이 충족되는 순간 바로 반환 (고정 sleep 대체). 대기 시간은 단계 리포트에 누적
+        if not cond or cond.get("until") in (None, "none"): return True
+        until = cond.get("until")
+        xpath = cond.get("xpath")
+        timeout = cond.get("timeout", timeout)
+        t0 = time.perf_counter()
+        try:
+            wait = WebDriverWait(self.driver, timeout, poll_frequency=0.05)
+            if until == "visible":
+                wait.until(EC.visibility_of_element_located((By.XPATH, xpath)))
+            elif until == "clickable":
+                wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
+            elif until == "options":
+                min_count = cond.get("min", 1)
+                wait.until(lambda d: len(d.find_elements(By.XPATH, xpath)) >= min_count)
+            elif until in ("dom_quiet", "network_idle"):
+                kind = "net" if until == "network_idle" else "dom"
+                self.driver.set_script_timeout(timeout + 1)
+                return bool(self.driver.execute_async_script(_WAIT_QUIET_JS, kind, cond.get("quiet_ms", 100), int(timeout * 1000)))
+            else:
+                raise ValueError(f"알 수 없는 대기 조건: {until}")
+            return True
+        except TimeoutException:
+            self.recorder.count("timeouts")
+            return False
+        finally:
+            self._step_wait_sec += time.perf_counter() - t0
+
+    def _click_locator(self, setting, key="xpath"):
+        # xpath 는 문자열 또는 후보 목록. 캐시 순위 1위만 정식 대기로 시도하고,
+        # 실패하면 나머지 후보 중 지금 보이는 것을 한 번에 찾아 클릭 (후보마다 1초씩 기다리지 않음)
+        candidates = setting.get(key)
+        if isinstance(candidates, str): candidates = [candidates]
+        name = setting.get("name", "Unknown")
+        ranked = self.locator_cache.rank(name, candidates)
+        t0 = time.perf_counter()
+        ok = self._quick_click(By.XPATH, ranked[0])
+        self.locator_cache.record(name, ranked[0], ok, time.perf_counter() - t0)
+        if ok:
+            self._last_locator = ranked[0]
+            return ranked[0]
+        rest = ranked[1:]
+        if not rest: return None
+        self.recorder.count("fallbacks")
+        try: index = self.driver.execute_script(_FIRST_VISIBLE_JS, rest)
+        except Exception: index = -1
+        if index is None or index < 0: return None
+        xpath = rest[index]
+        t0 = time.perf_counter()
+        ok = self._quick_click(By.XPATH, xpath)
+        self.locator_cache.record(name, xpath, ok, time.perf_counter() - t0)
+        if not ok: return None
+        self.update_log(f"  🩹 '{name}': 대체 경로 성공 -> 다음 실행부터 우선 사용 ({xpath})", "DETAIL")
+        self._last_locator = xpath
+        return xpath
+
+    def _step_custom(self, setting):
+        option_xpath_fmt = setting.get("option_xpath")
+        value_to_select = setting.get("value")
+        if not self._click_locator(setting, "open_xpath"): raise Exception("버튼 없음")
+        final_xpath = option_xpath_fmt.format(value_to_select)
+        if setting.get("batch"):
+            # 옵션 대기 후 배치 실행기로 한 번에 클릭 (clickable 대기 + 스크롤 + 클릭 왕복 생략)
+            self._wait_for({"until": "options", "xpath": final_xpath}, timeout=self._step_timeout)
+            result = self._batch_select(final_xpath, limit=1)
+            if result["count"] + result.get("already", 0) == 0: raise Exception("옵션 없음")
+        elif not self._quick_click(By.XPATH, final_xpath): raise Exception("옵션 없음")
+        self._verify_selected(final_xpath)
+        self.update_log(f"  👉 [Custom] '{setting.get('name')}': {value_to_select} 선택", "DETAIL")
+
+    def _step_button(self, setting):
+        if self._click_locator(setting):
+            self.update_log(f"  👉 [Button] '{setting.get('name')}' 클릭 완료", "DETAIL")
+        else:
+            raise Exception("버튼 클릭 실패")
+
+    def _batch_select(self, option_xpath, kind="all", value=None, container_xpath=None, fallback_xpath=None, limit=0):
+        # kind: all / contains / equals / hour_gte -> {'count', 'labels', 'scanned'}
+        pred = {"kind": kind, "value": value, "fallback": fallback_xpath, "limit": limit}
+        result = self.driver.execute_script(_BATCH_SELECT_JS, container_xpath, option_xpath, pred)
+        return result or {"count": 0, "labels": [], "scanned": 0}
+
+    def _step_batch_select(self, setting):
+        # 드랍다운 열기 -> 조건에 맞는 옵션 일괄 클릭 (Select All, 다중 선택 등)
+        option_xpath = setting.get("option_xpath")
+        if setting.get("open_xpath"):
+            if not self._click_locator(setting, "open_xpath"): raise Exception("드랍다운 열기 실패")
+            self._wait_for({"until": "options", "xpath": option_xpath}, timeout=self._step_timeout)
+        result = self._batch_select(option_xpath, setting.get("match", "all"), setting.get("value"), limit=setting.get("limit", 0))
+        if result["count"] + result.get("already", 0) == 0: raise Exception(f"일치 옵션 없음 (검사 {result['scanned']}개)")
+        self._verify_selected(option_xpath, labels=result["labels"])
+        self.update_log(f"  👉 [Batch] '{setting.get('name')}': {result['count']}개 선택", "DETAIL")
+
+    # ⭐️ [ExSD 전용] 11시 이후 시간 자동 선택
+    def _step_time_filter(self, setting):
+        start_hour = setting.get("start_hour", 11)
+        option_xpath = ".//*[contains(text(), ':')]"
+
+        # 1. 드랍다운 열기 -> 옵션 목록이 채워지는 즉시 진행
+        open_xpath = self._click_locator(setting, "open_xpath")
+        if not open_xpath: raise Exception("드랍다운 열기 실패")
+        menu_xpath = open_xpath + "/following-sibling::div"
+        self._wait_for({"until": "options", "xpath": menu_xpath + option_xpath[1:]}, timeout=self._step_timeout)
+
+        # 2. 시간 파싱/판정/클릭을 브라우저에서 한 번에 (조건 맞는 항목 전부 선택, break 없음)
+        result = self._batch_select(option_xpath, "hour_gte", start_hour, container_xpath=menu_xpath,
+                                    fallback_xpath="//a[contains(text(), ':')]")
+        selected_count = result["count"] + result.get("already", 0)
+        if result["count"]: self._verify_selected(option_xpath, labels=result["labels"], container_xpath=menu_xpath)
+
+        if selected_count > 0:
+            self.update_log(f"  ⏱️ [Time] {start_hour}시 이후 항목 {selected_count}개 싹 다 선택 완료!", "DETAIL")
+        else:
+            self.update_log(f"  ⚠️ [Time] {start_hour}시 이후 항목이 없습니다.", "WARNING")
+
+    def _verify_selected(self, option_xpath, labels=None, container_xpath=None):
+        # 클릭한 옵션이 화면에서 선택 상태인지 확인. 화면이 상태를 드러내지 않거나 메뉴가 닫혔으면 통과
+        try: state = self.driver.execute_script(_SELECTION_STATE_JS, container_xpath, option_xpath, labels)
+        except Exception: return
+        if state and state["unselected"] and not state["selected"]:
+            raise Exception(f"선택 확인 실패 (미선택 {state['unselected']}개)")
+
+    def _step_budget(self, name, setting):
+        # -> (첫 시도 대기 한도, 재시도 간격, 재시도 횟수). 재시도마다 대기 한도/간격 2배
+        # 성공 기록 2회 이상: 평균 + 4*편차. 그 전에는 설정값(timeout) 또는 1초
+        # 필수가 아닌 단계는 성공한 적이 없거나 지난번에 실패했으면 재시도 없이 짧게 (없는 버튼에 매번 시간 쓰지 않음)
+        st = self.locator_cache.latency(name) or {"n": 0, "miss": 0}
+        critical = bool(setting.get("critical"))
+        timeout, backoff = float(setting.get("timeout", 1)), 0.5
+        if st["n"] >= 2:
+            timeout = min(max(st["avg"] + 4 * st["dev"], 0.5), self.step_timeout_max)
+            backoff = min(max(st["avg"], 0.2), 2.0)
+        if critical: return timeout, backoff, self.step_retries
+        if st.get("miss"): return min(timeout, 0.5), backoff, 0
+        return timeout, backoff, self.step_retries if st["n"] else 0
+
+    def _run_setting_step(self, setting):
+        # 동작 실행 -> 단계별 완료 조건(wait) 대기. 대기/실행 시간을 분리해서 기록
+        # 동작이 실패하면 간격을 늘려가며 다시 실행, 완료 조건만 못 채웠으면 동작은 두고 더 길게 다시 대기
+        name = setting.get("name", "Unknown")
+        dtype = setting.get("type", "custom")
+        handler = getattr(self, self.step_handlers[dtype]) if dtype in self.step_handlers else None
+        record = {"name": name, "type": dtype, "wait": 0.0, "action": 0.0, "ok": False, "ready": False, "attempts": 0}
+        self._step_wait_sec = 0.0
+        self._last_locator = None
+        timeout, backoff, retries = self._step_budget(name, setting)
+        t0 = time.perf_counter()
+        with self.recorder.step(name) as metrics:
+            for attempt in range(retries + 1):
+                self._step_timeout = min(timeout * 2 ** attempt, self.step_timeout_max)
+                record["attempts"] = attempt + 1
+                started = time.perf_counter()
+                try:
+                    if handler is None: raise Exception(f"알 수 없는 타입: {dtype}")
+                    if not record["ok"]:
+                        handler(setting)
+                        record["ok"] = True
+                    record["ready"] = self._wait_for(setting.get("wait", _DEFAULT_STEP_WAIT), timeout=self._step_timeout)
+                except Exception as e:
+                    record["error"] = str(e)
+                if record["ready"]:
+                    self.locator_cache.observe(name, time.perf_counter() - started)
+                    break
+                if handler is None or attempt == retries:
+                    # 동작 자체가 실패했을 때만 실패로 기록. 동작은 됐고 완료 조건만 시간 초과면 걸린 시간을 느린 표본으로
+                    # (다음 실행의 대기 한도가 늘어남)
+                    if record["ok"]: self.locator_cache.observe(name, time.perf_counter() - t0)
+                    else: self.locator_cache.observe(name, 0.0, ok=False)
+                    break
+                self.recorder.count("retries")
+                if record["ok"]:
+                    self.update_log(f"  ⌛ '{name}' 완료 조건 재대기 ({min(timeout * 2 ** (attempt + 1), self.step_timeout_max):.1f}s)", "DETAIL")
+                else:
+                    delay = backoff * 2 ** attempt
+                    self.update_log(f"  🔁 '{name}' 재시도 {attempt + 1}/{retries} ({delay:.1f}s 후) - {record['error']}", "DETAIL")
+                    time.sleep(delay)
+            total = time.perf_counter() - t0
+            record["wait"] = self._step_wait_sec
+            record["action"] = max(total - self._step_wait_sec, 0.0)
+            metrics.update(ok=record["ok"], wait_sec=round(record["wait"], 4), xpath=self._last_locator, attempts=record["attempts"])
+        return record
+
+    def _log_step_report(self, report):
+        if not report: return
+        self.update_log("📊 단계별 소요 시간 (대기 / 실행)", "INFO")
+        for r in report:
+            mark = "✅" if r["ok"] and r["ready"] else ("⌛" if r["ok"] else "❌")
+            self.update_log(f"  {mark} {r['name']}: 대기 {r['wait']:.2f}s / 실행 {r['action']:.2f}s", "DETAIL")
+        total_wait = sum(r["wait"] for r in report)
+        total_action = sum(r["action"] for r in report)
+        self.update_log(f"  합계: 대기 {total_wait:.2f}s / 실행 {total_action:.2f}s", "INFO")
+
     def _configure_page_settings(self):
         if not self.driver: return
         self.update_log("⚙️ 페이지 설정 시작...", "WARNING")
+        self._start_capture()
+        try: self.driver.execute_script(_PAGE_PROBE_JS)
+        except: pass
 
+        report = []
+        aborted = None
         for setting in self.dropdown_settings:
-            name = setting.get("name", "Unknown")
-            dtype = setting.get("type", "custom")
-            try:
-                if dtype == "custom":
-                    open_xpath = setting.get("open_xpath")
-                    option_xpath_fmt = setting.get("option_xpath")
-                    value_to_select = setting.get("value")
-                    if not self._quick_click(By.XPATH, open_xpath): raise Exception("버튼 없음")
-                    final_xpath = option_xpath_fmt.format(value_to_select)
-                    if not self._quick_click(By.XPATH, final_xpath): raise Exception("옵션 없음")
-                    self.update_log(f"  👉 [Custom] '{name}': {value_to_select} 선택", "DETAIL")
-
-                elif dtype == "button":
-                    target_xpath = setting.get("xpath")
-                    if self._quick_click(By.XPATH, target_xpath):
-                        self.update_log(f"  👉 [Button] '{name}' 클릭 완료", "DETAIL")
-                    else:
-                        raise Exception("버튼 클릭 실패")
-
-                # ⭐️ [ExSD 전용] 11시 이후 시간 자동 선택
-                elif dtype == "time_filter":
-                    open_xpath = setting.get("open_xpath")
-                    start_hour = setting.get("start_hour", 11)
-                    
-                    # 1. 드랍다운 열기
-                    if not self._quick_click(By.XPATH, open_xpath): raise Exception("드랍다운 열기 실패")
-                    time.sleep(0.5) 
-
-                    # 2. 옵션 찾기 (시간 정보가 있는 모든 요소)
-                    try:
-                        menu_container = self.driver.find_element(By.XPATH, open_xpath + "/following-sibling::div")
-                        options = menu_container.find_elements(By.XPATH, ".//*[contains(text(), ':')]")
-                    except:
-                        options = self.driver.find_elements(By.XPATH, "//a[contains(text(), ':')]")
-
-                    selected_count = 0
-                    
-                    # 3. 하나씩 검사하면서 조건 맞으면 무조건 클릭 (break 없음!)
-                    for opt in options:
-                        try:
-                            text = opt.text.strip() # 예: "2025-11-30 13:00:05 (WAVE1)"
-                            
-                            # 시간 추출 로직
-                            parts = text.split()
-                            target_hour = -1
-                            
-                            for part in parts:
-                                if ":" in part and part.count(":") >= 1:
-                                    try:
-                                        target_hour = int(part.split(":")[0])
-                                        break # (주의) 이건 글자 파싱을 멈추는거지, 옵션 선택을 멈추는 게 아님!
-                                    except: continue
-                            
-                            # 11시 이상이면 -> 클릭!
-                            if target_hour >= start_hour:
-                                self.driver.execute_script("arguments[0].click();", opt)
-                                selected_count += 1
-                                # 멈추지 않고 다음 옵션으로 넘어감 (Loop 계속됨)
-                                
-                        except Exception as inner_e:
-                            pass # 하나 클릭하다 에러 나도 멈추지 말고 다음 거 계속 시도
-                            
-                    if selected_count > 0:
-                        self.update_log(f"  ⏱️ [Time] {start_hour}시 이후 항목 {selected_count}개 싹 다 선택 완료!", "DETAIL")
-                    else:
-                        self.update_log(f"  ⚠️ [Time] {start_hour}시 이후 항목이 없습니다.", "WARNING")
+            record = self._run_setting_step(setting)
+            report.append(record)
+            if not record["ok"] and setting.get("critical"):
+                aborted = record
+                self.update_log(f"⛔ 필수 단계 실패 '{record['name']}' ({record.get('error')}) -> 설정 중단", "ERROR")
+                break
+            if not record["ok"]:
+                self.update_log(f"⚠️ [패스] '{record['name']}' ({record.get('error')})", "WARNING")
+            elif not record["ready"]:
+                self.update_log(f"⌛ '{record['name']}' 완료 조건 대기 시간 초과 -> 계속 진행", "WARNING")
 
-                time.sleep(0.5) 
-            except Exception as e:
+        self.last_step_report = report
+        self.locator_cache.save()
+        self._log_step_report(report)
+        if aborted: raise _StepAborted(f"{aborted['name']}: {aborted.get('error')}")
+        self.update_log("✅ 모든 페이지 설정 완료.", "SUCCESS")
 
-                time.sleep(0.5) 
-            except Exception as e:
-                self.update_log(f"⚠️ [패스] '{name}' ({e})", "WARNING")
+    def _extract_target_table(self):
+        # 대상 테이블 하나만 브라우저에서 JSON 배열로 가져옴. 못 찾으면 None
+        target = self.table_target
+        locator = f"//*[@id='{target['id']}']" if target["id"] else (target["xpath"] or "//table")
+        self._wait_for({"until": "visible", "xpath": locator}, timeout=3)
+        payload = self.driver.execute_script(_EXTRACT_TABLE_JS, target)
+        if not payload: return None
+        self.update_log(f"🎯 대상 테이블 추출: #{payload['index'] + 1} ({len(payload['rows'])}행)", "DETAIL")
+        return _frame_from_payload(payload)
 
-        self.update_log("✅ 모든 페이지 설정 완료.", "SUCCESS")
+    def _scan_all_tables(self):
+        # 전체 페이지 스캔 (명시적 fallback)
+        try: WebDriverWait(self.driver, 3).until(EC.presence_of_element_located((By.TAG_NAME, "table")))
+        except: pass
+        html_source = self.driver.page_source
+        try: return [_normalize_frame(df) for df in pd.read_html(io.StringIO(html_source))]
+        except: return []
+
+    def _start_capture(self):
+        # 설정 단계 전에 호출: 이전 performance 로그를 비워서 이번 검색 응답만 남김
+        if not self.capture_url: return
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.get_log("performance")
+        except Exception as e:
+            self.update_log(f"⚠️ 네트워크 캡처 사용 불가 ({e})", "WARNING")
+
+    def _captured_frame(self):
+        # capture_url 에 맞는 마지막 응답 본문(JSON) -> DataFrame. 없으면 None
+        try: entries = self.driver.get_log("performance")
+        except Exception: return None
+        pattern = re.compile(self.capture_url)
+        request_id, url = None, ""
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            if message.get("method") != "Network.responseReceived": continue
+            response = message["params"]["response"]
+            if pattern.search(response.get("url", "")):
+                request_id, url = message["params"]["requestId"], response["url"]
+        if request_id is None: return None
+        try:
+            body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            text = base64.b64decode(body["body"]).decode("utf-8") if body.get("base64Encoded") else body["body"]
+            records = _find_records(json.loads(text), self.capture_json_path)
+        except Exception as e:
+            self.update_log(f"⚠️ 응답 본문 읽기 실패: {e}", "WARNING")
+            return None
+        if not records: return None
+        self.update_log(f"📡 네트워크 응답에서 {len(records)}행 추출 ({url})", "DETAIL")
+        return _normalize_frame(pd.json_normalize(records))
+
+    def _collect_tables(self):
+        with self.recorder.step("테이블 추출"):
+            return self._collect_tables_inner()
+
+    def _collect_tables_inner(self):
+        # 네트워크 캡처 -> 대상 테이블 추출 -> 전체 스캔 순서. self.all_tables 갱신
+        self.all_tables = []
+        # 고정 1초 대기 대신 검색 통신이 끝나는 즉시 진행
+        self._wait_for({"until": "network_idle", "quiet_ms": 200}, timeout=3)
+        if self.capture_url:
+            df = self._captured_frame()
+            if df is not None:
+                self.all_tables = [df]
+                self.update_log("✅ 네트워크 응답으로 테이블 구성 (DOM 파싱 생략)", "SUCCESS")
+                return self.all_tables
+            self.update_log("⚠️ 일치하는 네트워크 응답 없음 -> DOM 추출로 전환", "WARNING")
+            self.recorder.count("fallbacks")
+        if self.extract_mode == "target":
+            df = self._extract_target_table()
+            if df is not None: self.all_tables = [df]
+            else:
+                self.update_log("⚠️ 대상 테이블을 찾지 못함 -> 전체 스캔으로 전환", "WARNING")
+                self.recorder.count("fallbacks")
+        if not self.all_tables:
+            self.all_tables = self._scan_all_tables()
+        self.update_log(f"✅ 총 {len(self.all_tables)}개의 테이블 발견.", "SUCCESS")
+        return self.all_tables
 
     def start_scraping(self):
         self.update_log("⏳ 테이블 탐색 중...", "WARNING")
-        time.sleep(1)
-        self.all_tables = []
         try:
-            try: WebDriverWait(self.driver, 3).until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-            except: pass
-            html_source = self.driver.page_source
-            try: self.all_tables = pd.read_html(io.StringIO(html_source))
-            except: self.all_tables = []
-            num = len(self.all_tables)
-            self.update_log(f"✅ 총 {num}개의 테이블 발견.", "SUCCESS")
-            if num >= 1: self._open_full_selection_window()
+            if self._collect_tables(): self._open_full_selection_window()
             else: self.update_log("ℹ️ 테이블이 없지만 설정은 완료되었습니다.", "DETAIL")
         except Exception as e:
             self.update_log(f"❌ 탐색 오류: {e}", "ERROR")
 
-    def _finalize_export(self, df_selected: pd.DataFrame, source_window: tk.Toplevel):
-        excel_path = self.excel_path.get()
+    # ---- 페이지 단위 스트리밍 추출 ---------------------------------------------
+    def _iter_table_pages(self):
+        # 페이지(스크롤 한 화면)마다 (페이지 번호, 새 행 DataFrame) 를 하나씩 반환.
+        # 중복은 직전 두 페이지의 행 키로만 검사 (페이지 경계/스크롤 겹침용) -> 행 수와 무관하게 메모리 일정
+        mode, xpath = ("scroll", self.page_scroll_xpath) if self.page_scroll_xpath else ("next", self.page_next_xpath)
+        recent = collections.deque(maxlen=2)
+        empty_pages = 0
+        for page in range(self.page_max):
+            payload = self.driver.execute_script(_EXTRACT_TABLE_JS, self.table_target)
+            if not payload: break
+            raw = _frame_from_payload(payload, normalize=False)
+            key_cols = [c for c in self.export_key if c in raw.columns]
+            keys, _ = _ExportState.row_hashes(raw, key_cols)
+            fresh = ~pd.Index(keys).duplicated()
+            if recent: fresh &= ~np.isin(keys, np.concatenate(list(recent)))
+            recent.append(keys)
+            if fresh.any():
+                empty_pages = 0
+                yield page, _normalize_frame(raw[fresh].reset_index(drop=True))
+            else:
+                empty_pages += 1
+                if empty_pages >= 2: break
+            if not self.driver.execute_script(_ADVANCE_PAGE_JS, mode, xpath): break
+            self._wait_for({"until": "dom_quiet", "quiet_ms": 150}, timeout=5)
+
+    def _stream_export(self):
+        # 페이지 묶음을 받는 대로 저장. 첫 묶음은 바로, 이후는 stream_flush_rows 행 단위 -> 마지막 페이지 전에 앞 행이 시트에 반영
+        # 보조 시트 복사는 실행당 한 번 (첫 저장) 만
+        # 저장은 저장 스레드가 하고 여기서는 다음 페이지로 바로 넘어감. 끝에서 남은 저장을 기다림
+        buffer, total, pending = [], 0, []
+        def flush():
+            nonlocal buffer
+            pending.append(self._queue_rows(pd.concat(buffer, ignore_index=True), with_secondary=not pending))
+            buffer = []
+        with self.recorder.step("스트리밍 추출/저장"):
+            for page, chunk in self._iter_table_pages():
+                buffer.append(chunk)
+                total += len(chunk)
+                self.update_log(f"📄 {page + 1}페이지: 새 행 {len(chunk)}개 (누적 {total}행)", "DETAIL")
+                if not pending or sum(len(c) for c in buffer) >= self.stream_flush_rows: flush()
+            if buffer: flush()
+            results = [self._export_result(f) for f in pending]
+        # 합쳐서 한 번에 쓴 작업은 같은 결과를 공유하므로 저장 횟수는 결과 객체 기준
+        saves = len({id(r) for r in results if r[0]})
+        failed = sum(1 for r in results if not r[0])
+        status = "no_table" if not total else ("export_error" if failed else "saved")
+        self.update_log(f"✅ 스트리밍 완료: {total}행 / 저장 {saves}회", "SUCCESS" if status == "saved" else "WARNING")
+        self._finish_run(status)
+        return status
+
+    # ---- 실시간 감시 ----------------------------------------------------------
+    def _watch_target(self):
+        # 감시할 테이블 {index, headers, rows}: table_* 설정이 있으면 추출과 같은 대상,
+        # 없으면 화면의 모든 테이블에서 _pick_table 과 같은 규칙(table_rule)으로 고름 (첫 번째 레이아웃용 table 이 아니라)
+        if any(self.table_target.values()): return self.driver.execute_script(_EXTRACT_TABLE_JS, self.table_target)
+        found = self.driver.execute_script(_EXTRACT_TABLE_JS, dict(self.table_target, all=True)) or []
+        pick = _table_rule_index([_frame_from_payload(p, normalize=False) for p in found], self.table_rule)
+        return None if pick is None else found[pick]
+
+    def _install_watch(self):
+        # 대상 테이블을 찾아 감시 설치 -> 현재 내용 (행 키 인덱스 문자열 프레임) / 못 찾으면 None
+        payload = self._watch_target()
+        if not payload: return None
+        headers = list(payload["headers"])
+        key_idx = [headers.index(c) for c in self.export_key if c in headers]
+        snapshot = self.driver.execute_script(_WATCH_INSTALL_JS, payload["index"], key_idx)
+        if not snapshot: return None
+        width = max([len(headers)] + [len(r) for r in snapshot["rows"]])
+        columns = headers + [f"col{i}" for i in range(len(headers), width)]
+        return _delta_frame(zip(snapshot["keys"], snapshot["rows"]), columns)
+
+    def _watch_loop(self, on_frame=None, target=None):
+        # 설정된 페이지를 그대로 두고 watch_interval 초마다 변경분만 받아서 (execute_script 1회)
+        # 새 행/바뀐 행만 저장하고 on_frame(미리보기용 문자열 프레임) 호출. _watch_stop 이 set 되면 종료
+        # target: 저장 위치 (GUI 에서는 Tk 스레드에서 미리 읽어서 넘김)
+        target = target or self._export_target()
+        with self.recorder.step("감시 설치"):
+            frame = self._install_watch()
+        if frame is None:
+            self.update_log("❌ 감시할 테이블을 찾지 못함 (table_* 설정 확인)", "ERROR")
+            return False
+        self.update_log(f"👁 실시간 감시 시작: {len(frame)}행 / {self.watch_interval:g}초 간격", "SUCCESS")
+        if len(frame): self._queue_rows(_normalize_frame(frame.reset_index(drop=True)), target=target)
+        if on_frame: on_frame(frame)
+        while not self._watch_stop.wait(self.watch_interval):
+            try: delta = self.driver.execute_script(_WATCH_POLL_JS)
+            except Exception as e:
+                self.update_log(f"❌ 감시 중단 (브라우저 응답 없음): {e}", "ERROR")
+                break
+            if not delta: continue
+            with self.recorder.step("감시 반영"):
+                if delta.get("lost"):
+                    # 검색 등으로 표가 새로 그려짐 -> 다시 설치하고 전체 비교는 변경 감지(_save_rows)에 맡김
+                    self.update_log("🔄 테이블이 다시 그려짐 -> 감시 재설치", "WARNING")
+                    frame = self._install_watch()
+                    if frame is None: continue
+                    changed = frame
+                else:
+                    frame, changed = _apply_table_delta(frame, delta)
+                    self.update_log(f"👁 변경: 추가 {len(delta['inserted'])} / 수정 {len(delta['updated'])} / 삭제 {len(delta['removed'])}", "DETAIL")
+                if len(changed): self._queue_rows(_normalize_frame(changed.reset_index(drop=True)), with_secondary=False, target=target)
+            if on_frame: on_frame(frame)
+        self.update_log("👁 실시간 감시 종료", "WARNING")
+        return True
+
+    def toggle_watch(self):
+        # GUI 토글: 브라우저/페이지 설정이 끝난 상태에서 감시 시작, 다시 누르면 중지
+        if self._watch_stop is not None and not self._watch_stop.is_set():
+            self._watch_stop.set()
+            return
+        if not self.driver:
+            self.update_log("⚠️ 먼저 [1. 시작하기]로 브라우저와 페이지 설정을 끝내주세요.", "WARNING")
+            return
+        _ensure_heavy_imports()
+        self._watch_stop = threading.Event()
+        win = tk.Toplevel(self.master)
+        win.title("👁 실시간 감시")
+        win.geometry("1100x600")
+        status = ttk.Label(win, text="설치 중...")
+        status.pack(fill='x', padx=5, pady=5)
+        # 감시 스레드는 최신 프레임만 넣어두고, 화면 갱신은 Tk 스레드의 poll 이 담당 (스레드에서 Tk 호출 없음)
+        latest = queue.SimpleQueue()
+        holder = {}
+        finished = threading.Event()
+        target = self._export_target()
+
+        def run():
+            self._begin_run()
+            try: self._watch_loop(latest.put, target)
+            finally:
+                self._finish_run("watch", target["path"])
+                finished.set()
+
+        def poll():
+            frame = None
+            while not latest.empty(): frame = latest.get()
+            if frame is not None and win.winfo_exists():
+                view = frame.reset_index(drop=True)
+                if "table" not in holder: holder["table"] = _create_dataframe_view(win, view, height=25)
+                else: holder["table"].set_frame(view)
+                status.config(text=f"{datetime.now().strftime('%H:%M:%S')} 기준 {len(view)}행")
+            if not finished.is_set():
+                self.master.after(LOG_FLUSH_MS, poll)
+                return
+            self.watch_button.config(text="👁 실시간 감시")
+            self.main_button.config(state='normal')
+            if win.winfo_exists(): win.destroy()
+
+        win.protocol("WM_DELETE_WINDOW", self._watch_stop.set)
+        self.watch_button.config(text="⏹ 감시 중지")
+        self.main_button.config(state='disabled')
+        threading.Thread(target=run, daemon=True).start()
+        poll()
+
+    def _pick_table(self, tables):
+        if self.extract_mode == "target" and len(tables) == 1: return tables[0]
+        return _select_table_by_rule(tables, self.table_rule)
+
+    # ---- 다중 센터 병렬 추출 -------------------------------------------------
+    def _fanout_jobs(self):
+        # 설정 값 목록의 조합 -> [(태그 열 dict, 단계 이름별 덮어쓰기 dict)]
+        jobs = []
+        for combo in itertools.product(*self.fanout_axes):
+            tags, overrides = {}, {}
+            for label, step, field, value in combo:
+                tags[label] = value
+                overrides.setdefault(step, {})[field] = value
+            jobs.append((tags, overrides))
+        return jobs
+
+    def _session_view(self, driver, tags, overrides):
+        # 설정/로그 큐는 공유하고 driver 와 단계 설정만 다른 얕은 복사본 (세션별 병렬 실행용)
+        view = copy.copy(self)
+        view.driver = driver
+        view._step_wait_sec = 0.0
+        view.all_tables = []
+        view.dropdown_settings = [dict(st, **overrides.get(st.get("name"), {})) for st in self.dropdown_settings]
+        prefix = "[" + " / ".join(str(v) for v in tags.values()) + "] "
+        view.update_log = lambda message, level="INFO": self.update_log(prefix + message, level)
+        return view
+
+    def _export_login_state(self):
+        # 메인 세션의 쿠키(전체 도메인) + localStorage -> 작업용 세션에 복제
+        cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        keys = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority")
+        cookies = [{k: c[k] for k in keys if k in c and not (k == "expires" and c.get("session"))} for c in cookies]
+        try: storage = self.driver.execute_script("return Object.assign({}, window.localStorage);")
+        except Exception: storage = {}
+        return cookies, storage
+
+    def _open_worker_browser(self, cookies, storage):
+        # 임시 프로필의 헤드리스 크롬 (프로필 잠금 충돌 없음) + 로그인 상태 복제
+        profile_dir = tempfile.mkdtemp(prefix='zxc_session_')
+        options = Options()
+        options.add_argument(f"user-data-dir={profile_dir}")
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        self._enable_capture_logging(options)
+        driver = None
+        try:
+            driver = webdriver.Chrome(options=options)
+            driver.zxc_profile_dir = profile_dir
+            _instrument_driver(driver, self.recorder)
+            driver.execute_cdp_cmd("Network.enable", {})
+            if cookies: driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            if storage:
+                driver.get(self.target_url.get())
+                driver.execute_script("var s = arguments[0]; for (var k in s) localStorage.setItem(k, s[k]);", storage)
+            return driver
+        except Exception:
+            if driver is not None:
+                try: driver.quit()
+                except Exception: pass
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+
+    def _run_fanout_job(self, pool, tags, overrides):
+        with self.recorder.step("세션 대기"):
+            driver = pool.acquire()
+        try:
+            view = self._session_view(driver, tags, overrides)
+            driver.get(self.target_url.get())
+            view._configure_page_settings()
+            df = view._pick_table(view._collect_tables())
+            if df is None or df.empty: return None
+            # 태그 열은 "<라벨>_fanout" (표에 이미 센터/단위 열이 있어도 충돌하지 않음)
+            df = df.copy()
+            for pos, (label, value) in enumerate(tags.items()):
+                df.insert(pos, f"{label}_fanout", value)
+            return df
+        finally:
+            pool.release(driver)
+
+    def _run_fanout(self):
+        # 조합별 설정 -> 추출을 최대 max_sessions 개 세션에서 병렬 실행하고 하나로 합침
+        jobs = self._fanout_jobs()
+        workers = min(self.max_sessions, len(jobs))
+        self.update_log(f"🚀 병렬 추출 시작: {len(jobs)}개 조합 / 세션 {workers}개", "WARNING")
+        t0 = time.perf_counter()
+        cookies, storage = self._export_login_state()
+        pool = _SessionPool(self.driver, workers, lambda: self._open_worker_browser(cookies, storage))
+        frames = []
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._run_fanout_job, pool, tags, overrides) for tags, overrides in jobs]
+                for (tags, _), future in zip(jobs, futures):
+                    label = " / ".join(str(v) for v in tags.values())
+                    try: df = future.result()
+                    except Exception as e:
+                        self.update_log(f"❌ [{label}] 추출 실패: {e}", "ERROR")
+                        continue
+                    if df is None: self.update_log(f"⚠️ [{label}] 테이블 없음", "WARNING")
+                    else: frames.append(df)
+        finally:
+            pool.close()
+        self.update_log(f"✅ 병렬 추출 완료: {len(frames)}/{len(jobs)}개 ({time.perf_counter() - t0:.1f}s)", "SUCCESS")
+        # 세션마다 category 범주가 달라 합치면 object 로 풀리므로 한 번 더 정리
+        return _normalize_frame(pd.concat(frames, ignore_index=True)) if frames else None
+
+    def _start_fanout_scraping(self):
+        try:
+            df = self._run_fanout()
+        except Exception as e:
+            self.update_log(f"❌ 병렬 추출 오류: {e}", "ERROR")
+            return
+        self.all_tables = [df] if df is not None else []
+        if self.all_tables: self._open_full_selection_window()
+
+    def _export_table(self, df_selected):
+        # 저장 + 실행 기록 마감 (헤드리스: 끝날 때까지 대기). 저장한 파일 경로 반환, 실패 시 None
+        if not self.recorder.active: self.recorder.begin()
+        target = self._export_target()
+        saved_path, status = self._export_result(self._queue_rows(df_selected, target=target))
+        self._finish_run(status, target["path"])
+        return saved_path
+
+    def _export_result(self, future):
+        # 저장 작업 완료 대기 -> (저장 경로 | None, 상태). 저장 스레드에서 난 예외는 실패로
+        try: return future.result()
+        except Exception as e:
+            self.update_log(f"❌ 저장 실패: {e}", "ERROR")
+            return None, "export_error"
+
+    def _submit_export(self, df_selected):
+        # 저장 스레드에 넘기고 바로 반환 -> Future[(저장 경로 | None, 상태)]. 저장이 끝나면 이 실행의 기록 마감
+        if not self.recorder.active: self.recorder.begin()
+        run_id = self.recorder.run_id
+        target = self._export_target()
+        future = self._queue_rows(df_selected, target=target)
+        def finish(f):
+            if self.recorder.run_id == run_id: self._finish_run("export_error" if f.exception() else f.result()[1], target["path"])
+        future.add_done_callback(finish)
+        return future
+
+    def _export_target(self):
+        # 저장 위치(경로/시트 이름/시작 행)를 지금 값으로 고정. Tk 스레드(또는 작업을 넘기는 쪽)에서 호출
+        return {"path": self.excel_path.get(), "sheet": self.sheet_name.get(), "start_row": self.start_row.get(),
+                "secondary_sheet": self.secondary_sheet_name.get(), "secondary_start_row": self.secondary_start_row.get()}
+
+    def _queue_rows(self, df, with_secondary=True, target=None):
+        return self.export_worker.submit(target or self._export_target(), df, with_secondary)
+
+    def _save_rows(self, target, df_selected, with_secondary=True, temp_on_locked=True):
+        # 저장 본체 -> (저장한 파일 경로 | None, 상태). 저장 스레드(_ExportWorker)에서 호출
+        # temp_on_locked=False 면 파일 열림(PermissionError)을 그대로 올려서 저장 스레드가 다시 시도
+        excel_path = target["path"]
         self.update_log("==========================================", "INFO")
         self.update_log("🚀 엑셀 저장 프로세스 진입", "WARNING")
-        df_full = df_selected.replace([float('inf'), float('-inf')], float('nan')).fillna(0)
-        existing_sheets = {}
-        if os.path.exists(excel_path):
-            try: existing_sheets = pd.read_excel(excel_path, sheet_name=None, header=None)
-            except: pass
+        # 추출 단계에서 타입 정리된 프레임을 그대로 사용 (결측/inf 는 쓰기 단계에서 0 으로)
+        df_full = df_selected
+        saved_path = None
+
+        # 지난 저장과 같은 테이블이면 디스크 I/O 없이 종료, 아니면 새 행/바뀐 행만 저장
+        state = _ExportState(os.path.splitext(excel_path)[0] + "_state.json", excel_path)
+        sheet = target["sheet"]
+        key_cols = [c for c in self.export_key if c in df_full.columns]
+        if len(key_cols) != len(self.export_key):
+            self.update_log(f"⚠️ export_key 열 없음 -> 행 전체로 비교 ({', '.join(self.export_key)})", "WARNING")
+            key_cols = []
+        keys, rows = _ExportState.row_hashes(df_full, key_cols)
+        table_hash = _ExportState.table_hash(df_full, rows)
+        if os.path.exists(excel_path) and state.unchanged(sheet, table_hash):
+            self.update_log("⏭️ 지난 저장과 동일한 테이블 -> 저장 생략", "SUCCESS")
+            self.update_log("==========================================", "INFO")
+            return excel_path, "unchanged"
+        changed = state.changed_mask(sheet, keys, rows) if os.path.exists(excel_path) else np.ones(len(rows), dtype=bool)
+        if not changed.any():
+            self.update_log("⏭️ 새 행/바뀐 행 없음 -> 저장 생략", "SUCCESS")
+            state.update(sheet, table_hash, keys, rows)
+            state.save()
+            self.update_log("==========================================", "INFO")
+            return excel_path, "unchanged"
+        if not changed.all():
+            self.update_log(f"🔍 전체 {len(rows)}행 중 새 행/바뀐 행 {int(changed.sum())}개만 저장", "DETAIL")
+            df_full = df_full[changed]
+        summary = self._update_summary(state, target, df_full)
+
         try:
-            self._write_to_excel_file(excel_path, df_full, existing_sheets)
+            self._write_to_excel_file(excel_path, df_full, with_secondary=with_secondary, summary=summary, target=target)
             self.update_log("🎉 저장 완료! (원본 파일 갱신됨)", "SUCCESS")
-            source_window.destroy()
+            saved_path = excel_path
+            state.update(sheet, table_hash, keys, rows)
+            if summary is not None: state.set_summary(sheet, summary)
+            state.save()
+            self._append_history(df_full)
         except PermissionError:
+            if not temp_on_locked: raise
             self.update_log("❌ 파일 열림 오류 -> 임시 저장 시도", "ERROR")
+            self.recorder.count("fallbacks")
             base, ext = os.path.splitext(excel_path)
             temp_path = f"{base}_TEMP_{datetime.now().strftime('%H%M%S')}{ext}"
             try:
-                self._write_to_excel_file(temp_path, df_full, existing_sheets)
-                messagebox.showinfo("임시 저장", f"파일: {temp_path}\n(원본이 열려있어 임시저장했습니다)")
+                self._write_to_excel_file(temp_path, df_full, source_path=excel_path, with_secondary=with_secondary, summary=summary, target=target)
                 self.update_log(f"✅ 임시 저장 완료: {temp_path}", "SUCCESS")
-                source_window.destroy()
+                saved_path = temp_path
             except Exception as e:
                 self.update_log(f"❌ 임시 저장 실패: {e}", "ERROR")
         except Exception as e:
             self.update_log(f"❌ 저장 실패: {e}", "ERROR")
         self.update_log("==========================================", "INFO")
+        return saved_path, ("saved" if saved_path else "export_error")
+
+    def _update_summary(self, state, target, df_new):
+        # 보조 시트 요약 = 사이드카의 누계 + 이번에 추가할 행 집계 (비용은 새 행 수와 그룹 수에만 비례)
+        # 누계가 없으면(첫 저장/워크북이 밖에서 수정됨) 기본 시트 데이터 영역에서 1회 재구성. 설정 안 했으면 None
+        if not self.summary_group_by: return None
+        missing = [c for c in self.summary_group_by if c not in df_new.columns]
+        if missing:
+            self.update_log(f"⚠️ 요약 그룹 열 없음 ({', '.join(missing)}) -> 기존 방식(상단 32행 복사)", "WARNING")
+            return None
+        group_by = self.summary_group_by
+        sum_cols = [c for c in self.summary_sum if c in df_new.columns] if self.summary_sum else \
+            [c for c in df_new.columns if c not in group_by and pd.api.types.is_numeric_dtype(df_new[c])]
+        with self.recorder.step("요약 집계"):
+            new = _summarize(df_new, group_by, sum_cols, self.summary_time_col, self.summary_bucket)
+            prev = state.summary(target["sheet"])
+            if prev is None and os.path.exists(target["path"]):
+                prev = self._summary_from_sheet(target, _workbook_frame(df_new).columns, group_by, sum_cols)
+            summary = _merge_summary(prev, new, group_by)
+        self.update_log(f"🧮 요약: 새 행 {len(df_new)}개 -> {len(summary)}개 그룹 누계", "DETAIL")
+        return summary
 
-    def _write_to_excel_file(self, target_path, df_full, existing_sheets):
-        USER_SHEET_NAME = self.sheet_name.get() 
-        FIXED_SHEET_NAME = self.secondary_sheet_name.get()
+    def _summary_from_sheet(self, target, columns, group_by, sum_cols):
+        # 기본 시트 데이터 영역(primary_start_row 부터)을 현재 열 이름으로 읽어 집계. 모양이 다르면 None (새로 시작)
         try:
-            USER_START_ROW = int(self.start_row.get())
-            FIXED_START_ROW = int(self.secondary_start_row.get())
+            raw = pd.read_excel(target["path"], sheet_name=target["sheet"], header=None, skiprows=int(target["start_row"]) - 1)
+        except Exception:
+            return None
+        if raw.empty or raw.shape[1] < len(columns): return None
+        raw = raw.iloc[:, :len(columns)]
+        raw.columns = columns
+        self.update_log(f"🧮 요약 누계 재구성: 기존 {len(raw)}행", "DETAIL")
+        return _summarize(_normalize_frame(raw), group_by, sum_cols, self.summary_time_col, self.summary_bucket)
+
+    def _append_history(self, df):
+        # 워크북에 추가한 행을 이력 저장소에도 기록 (실패해도 엑셀 저장은 유효)
+        with self.recorder.step("이력 저장"):
+            try:
+                store = _HistoryStore(self.history_dir, self.history_center_col)
+                files = store.append(df, self.recorder.run_id or datetime.now().strftime("%Y%m%d-%H%M%S"))
+                self.update_log(f"🗄️ 이력 저장: {len(df)}행 / {len(files)}개 파티션 ({store.ext})", "DETAIL")
+            except Exception as e:
+                self.update_log(f"⚠️ 이력 저장 실패: {e}", "WARNING")
+
+    def _finalize_export(self, df_selected: "pd.DataFrame", source_window: tk.Toplevel):
+        # 저장은 저장 스레드에서. 창은 저장이 끝나면 닫힘 (실패하면 그대로 두고 다시 저장 가능)
+        _ensure_heavy_imports()
+        excel_path = self.excel_path.get()
+        self.update_log("💾 저장 대기열에 추가 (창은 저장 완료 후 닫힘)", "DETAIL")
+        def done(future):
+            saved_path = None if future.exception() else future.result()[0]
+            if saved_path is None: return
+            if saved_path != excel_path:
+                messagebox.showinfo("임시 저장", f"파일: {saved_path}\n(원본이 오래 열려있어 임시저장했습니다)")
+            if source_window.winfo_exists(): source_window.destroy()
+        self._when_done(self._submit_export(df_selected), done)
+
+    def _when_done(self, future, callback, interval_ms=100):
+        # Tk 스레드에서 Future 완료를 폴링해서 callback(future) 호출 (저장 스레드에서 Tk 를 건드리지 않음)
+        def poll():
+            if future.done(): callback(future)
+            else: self.master.after(interval_ms, poll)
+        poll()
+
+    def _write_to_excel_file(self, target_path, df_full, source_path=None, with_secondary=True, summary=None, target=None):
+        # target: _export_target() 로 미리 읽어 둔 시트/시작 행 (저장 스레드에서는 반드시 넘김)
+        target = target or self._export_target()
+        df_full = _workbook_frame(df_full)
+        USER_SHEET_NAME = target["sheet"]
+        FIXED_SHEET_NAME = target["secondary_sheet"]
+        try:
+            USER_START_ROW = int(target["start_row"])
+            FIXED_START_ROW = int(target["secondary_start_row"])
         except: return
 
+        # 두 시트가 이미 있으면 새 행만 추가 (워크북 1회 열기, 다른 시트는 그대로)
+        source_path = source_path or target_path
+        appender = None
+        if os.path.exists(source_path):
+            with self.recorder.step("엑셀 열기"):
+                try: appender = _XlsxAppender(source_path)
+                except PermissionError: raise
+                except Exception: appender = None
+        if appender is not None:
+            try:
+                if appender.can_append(USER_SHEET_NAME) and appender.can_append(FIXED_SHEET_NAME):
+                    self._append_to_workbook(appender, target_path, df_full, USER_SHEET_NAME, FIXED_SHEET_NAME, USER_START_ROW, FIXED_START_ROW, with_secondary, summary)
+                    return
+            finally:
+                appender.close()
+
+        # 새 파일이거나 시트가 없으면 전체 쓰기
+        existing_sheets = {}
+        if os.path.exists(source_path):
+            with self.recorder.step("엑셀 읽기 (전체)"):
+                try: existing_sheets = pd.read_excel(source_path, sheet_name=None, header=None)
+                except: pass
+
         main_current_rows = 0
         if USER_SHEET_NAME in existing_sheets:
             try: main_current_rows = len(existing_sheets[USER_SHEET_NAME])
@@ -473,7 +2499,11 @@ class WebScraperApp:
             except: pass
 
         df_sub = pd.DataFrame()
-        if USER_SHEET_NAME in existing_sheets:
+        if summary is not None:
+            # 요약 블록이 보조 시트의 시작 행 아래를 통째로 차지 (이전 블록은 버림)
+            if FIXED_SHEET_NAME in existing_sheets:
+                existing_sheets[FIXED_SHEET_NAME] = existing_sheets[FIXED_SHEET_NAME].iloc[:FIXED_START_ROW - 1]
+        elif with_secondary and USER_SHEET_NAME in existing_sheets:
             try:
                 df_test_full = existing_sheets[USER_SHEET_NAME]
                 df_sub = df_test_full.iloc[0:32, :].copy() 
@@ -481,7 +2511,7 @@ class WebScraperApp:
 
         self.update_log("💾 디스크 쓰기 시작...", "WARNING")
         
-        with pd.ExcelWriter(target_path, engine='xlsxwriter') as writer:
+        with self.recorder.step("엑셀 저장 (전체)"), pd.ExcelWriter(target_path, engine='xlsxwriter') as writer:
             wb = writer.book
             fmt = wb.add_format({'border': 0, 'align': 'center', 'valign': 'vcenter'})
             for s_name, data in existing_sheets.items():
@@ -495,61 +2525,171 @@ class WebScraperApp:
             main_write_idx = max(USER_START_ROW - 1, main_current_rows)
             self.update_log(f"📍 '{USER_SHEET_NAME}' 저장 위치: {main_write_idx + 1}행", "DETAIL")
             
-            for idx, row in df_full.iterrows():
-                ws.write_row(main_write_idx + idx, 0, row.tolist(), fmt) 
+            _write_frame_xlsxwriter(ws, main_write_idx, df_full, fmt, fill=0)
                 
-            if not df_sub.empty:
+            if summary is not None:
+                if FIXED_SHEET_NAME in existing_sheets:
+                    existing_sheets[FIXED_SHEET_NAME].to_excel(writer, sheet_name=FIXED_SHEET_NAME, startrow=0, startcol=0, header=False, index=False)
+                ws_fixed = writer.sheets.get(FIXED_SHEET_NAME) or wb.add_worksheet(FIXED_SHEET_NAME)
+                writer.sheets[FIXED_SHEET_NAME] = ws_fixed
+                self.update_log(f"📍 '{FIXED_SHEET_NAME}' 요약 위치: {FIXED_START_ROW}행 ({len(summary)}개 그룹)", "DETAIL")
+                _write_frame_xlsxwriter(ws_fixed, FIXED_START_ROW - 1, _summary_block(summary, self.summary_group_by), fmt)
+            elif not df_sub.empty:
                 if FIXED_SHEET_NAME in existing_sheets:
                      existing_sheets[FIXED_SHEET_NAME].to_excel(writer, sheet_name=FIXED_SHEET_NAME, startrow=0, startcol=0, header=False, index=False)
                 fixed_write_idx = max(FIXED_START_ROW - 1, fixed_current_rows)
                 self.update_log(f"📍 '{FIXED_SHEET_NAME}' 저장 위치: {fixed_write_idx + 1}행", "DETAIL")
                 df_sub.to_excel(writer, sheet_name=FIXED_SHEET_NAME, startrow=fixed_write_idx, startcol=0, header=False, index=False)
 
+    def _append_to_workbook(self, appender, target_path, df_full, user_sheet, fixed_sheet, user_start_row, fixed_start_row, with_secondary=True, summary=None):
+        main_current_rows = appender.last_row(user_sheet)
+        fixed_current_rows = appender.last_row(fixed_sheet)
+        self.update_log("💾 디스크 쓰기 시작... (증분 추가)", "WARNING")
+        style = appender.center_style()
+
+        if summary is not None:
+            # 보조 시트: 요약 블록만 제자리에 다시 씀. 이전 블록이 더 길었으면 남는 행은 빈 행으로 덮음
+            block = _summary_block(summary, self.summary_group_by)
+            stale = fixed_current_rows - (fixed_start_row - 1) - len(block)
+            if stale > 0: block = pd.concat([block, pd.DataFrame([[None] * block.shape[1]] * stale, dtype=object)], ignore_index=True)
+            self.update_log(f"📍 '{fixed_sheet}' 요약 위치: {fixed_start_row}행 ({len(summary)}개 그룹)", "DETAIL")
+            appender.write_frame(fixed_sheet, fixed_start_row - 1, block, style)
+        # 보조 시트: 기존 기본 시트 상단 32행 복사 (전체 쓰기와 동일하게 추가 전 내용 기준)
+        elif with_secondary:
+            fixed_write_idx = max(fixed_start_row - 1, fixed_current_rows)
+            self.update_log(f"📍 '{fixed_sheet}' 저장 위치: {fixed_write_idx + 1}행", "DETAIL")
+            appender.copy_rows(user_sheet, 1, 32, fixed_sheet, fixed_write_idx)
+
+        main_write_idx = max(user_start_row - 1, main_current_rows)
+        self.update_log(f"📍 '{user_sheet}' 저장 위치: {main_write_idx + 1}행", "DETAIL")
+        with self.recorder.step("엑셀 저장 (증분)"):
+            appender.write_frame(user_sheet, main_write_idx, df_full, style, fill=0)
+            appender.save(target_path)
+
+def _format_cell(v):
+    if v is None or (isinstance(v, float) and v != v): return ""
+    return str(v)
+
+class _VirtualTable:
+    # 보이는 행/열만 Treeview 에 그리는 표. 스크롤할 때 보이는 칸만 문자열로 변환
+    def __init__(self, parent_frame, df, height=8, max_cols=12):
+        self.df = df
+        self.row0 = 0
+        self.col0 = 0
+        self.max_cols = max(1, min(max_cols, df.shape[1]))
+        self.frame = ttk.Frame(parent_frame)
+        self.frame.pack(fill='both', expand=True, padx=5, pady=5)
+        self.scroll_y = ttk.Scrollbar(self.frame, command=self._on_yscroll)
+        self.scroll_y.pack(side='right', fill='y')
+        self.scroll_x = ttk.Scrollbar(self.frame, orient='horizontal', command=self._on_xscroll)
+        self.scroll_x.pack(side='bottom', fill='x')
+        self.slots = [f"c{i}" for i in range(self.max_cols)]
+        self.tree = ttk.Treeview(self.frame, columns=self.slots, show='headings', height=height)
+        for slot in self.slots:
+            self.tree.column(slot, width=120, anchor='center')
+        self.items = [self.tree.insert("", "end", values=()) for _ in range(height)]
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>", "<Shift-MouseWheel>"):
+            self.tree.bind(seq, self._on_wheel)
+        self.tree.pack(fill='both', expand=True)
+        self._render()
+
+    def set_frame(self, df):
+        self.df = df
+        self.row0 = min(self.row0, max(len(df) - len(self.items), 0))
+        self.col0 = min(self.col0, max(df.shape[1] - self.max_cols, 0))
+        self._render()
+
+    def _render(self):
+        n_rows, n_cols = self.df.shape
+        col_end = min(self.col0 + self.max_cols, n_cols)
+        for i, slot in enumerate(self.slots):
+            c = self.col0 + i
+            self.tree.heading(slot, text=str(self.df.columns[c]) if c < col_end else "")
+        block = self.df.iloc[self.row0:self.row0 + len(self.items), self.col0:col_end]
+        rows = list(block.itertuples(index=False, name=None))
+        for k, iid in enumerate(self.items):
+            self.tree.item(iid, values=[_format_cell(v) for v in rows[k]] if k < len(rows) else ())
+        self.scroll_y.set(*self._fractions(self.row0, len(self.items), n_rows))
+        self.scroll_x.set(*self._fractions(self.col0, self.max_cols, n_cols))
+
+    @staticmethod
+    def _fractions(start, visible, total):
+        if total <= 0: return 0.0, 1.0
+        return start / total, min(start + visible, total) / total
+
+    @staticmethod
+    def _scroll_target(args, current, page, total):
+        if args[0] == "moveto": return int(float(args[1]) * total)
+        step = int(args[1]) * (page if args[2] == "pages" else 1)
+        return current + step
+
+    def _on_yscroll(self, *args):
+        limit = max(len(self.df) - len(self.items), 0)
+        self.row0 = max(0, min(self._scroll_target(args, self.row0, len(self.items), len(self.df)), limit))
+        self._render()
+
+    def _on_xscroll(self, *args):
+        limit = max(self.df.shape[1] - self.max_cols, 0)
+        self.col0 = max(0, min(self._scroll_target(args, self.col0, self.max_cols, self.df.shape[1]), limit))
+        self._render()
+
+    def _on_wheel(self, event):
+        if event.num == 4: step = -3
+        elif event.num == 5: step = 3
+        else: step = -3 if event.delta > 0 else 3
+        if event.state & 0x0001: self._on_xscroll("scroll", step // 3, "units")
+        else: self._on_yscroll("scroll", step, "units")
+        return "break"
+
 def _create_dataframe_view(parent_frame, df, height=8):
-    tree_frame = ttk.Frame(parent_frame)
-    tree_frame.pack(fill='both', expand=True, padx=5, pady=5)
-    scroll_y = ttk.Scrollbar(tree_frame)
-    scroll_y.pack(side='right', fill='y')
-    scroll_x = ttk.Scrollbar(tree_frame, orient='horizontal')
-    scroll_x.pack(side='bottom', fill='x')
-    columns = list(df.columns)
-    tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=height, yscrollcommand=scroll_y.set, xscrollcommand=scroll_x.set)
-    scroll_y.config(command=tree.yview)
-    scroll_x.config(command=tree.xview)
-    for col in columns:
-        tree.heading(col, text=col)
-        tree.column(col, width=120, anchor='center')
-    for row in df.itertuples(index=False):
-        safe_values = [str(v) for v in row]
-        tree.insert("", "end", values=safe_values)
-    tree.pack(fill='both', expand=True)
-    return tree
+    return _VirtualTable(parent_frame, df, height=height)
+
+def _build_table_card(app, win, parent, index):
+    # 목록에서 고른 테이블만 그때 카드로 생성
+    d = app.all_tables[index].dropna(how='all')
+    lf = ttk.LabelFrame(parent, text=f"📊 Table #{index+1} (크기: {d.shape[0]}행 x {d.shape[1]}열)", padding=10)
+    btn_frame = ttk.Frame(lf)
+    btn_frame.pack(fill='x', pady=(0, 5)) 
+    ttk.Button(btn_frame, text="✅ 이 데이터 저장하기", style='Green.TButton', command=lambda d=d: app._finalize_export(d, win)).pack(side='left')
+    _create_dataframe_view(lf, d, height=20)
+    return lf
 
 def _open_full_selection_window_impl(app):
     if app.selection_window: app.selection_window.destroy()
     win = tk.Toplevel(app.master)
     win.title(f"테이블 선택 (총 {len(app.all_tables)}개 발견)")
     win.geometry("1000x800")
-    canvas = tk.Canvas(win)
-    scrollbar = ttk.Scrollbar(win, orient="vertical", command=canvas.yview)
-    frm = ttk.Frame(canvas)
-    frm.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-    canvas.create_window((0,0), window=frm, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-    canvas.pack(side="top", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
-    for i, df in enumerate(app.all_tables):
-        d = df.dropna(how='all')
-        if len(d) < 2: continue 
-        lf = ttk.LabelFrame(frm, text=f"📊 Table #{i+1} (크기: {d.shape[0]}행 x {d.shape[1]}열)", padding=10)
-        lf.pack(fill='x', padx=10, pady=10)
-        btn_frame = ttk.Frame(lf)
-        btn_frame.pack(fill='x', pady=(0, 5)) 
-        ttk.Button(btn_frame, text="✅ 이 데이터 저장하기", style='Green.TButton', command=lambda d=d: app._finalize_export(d, win)).pack(side='left')
-        _create_dataframe_view(lf, d.head(5), height=5)
     bottom_frame = ttk.Frame(win, padding=10)
     bottom_frame.pack(side='bottom', fill='x')
     ttk.Button(bottom_frame, text="🔄 다시 탐색하기", style='Blue.TButton', command=lambda: app._restart_scraping(win)).pack(fill='x')
+
+    body = ttk.Frame(win)
+    body.pack(side='top', fill='both', expand=True)
+    list_frame = ttk.Frame(body, padding=(10, 10, 0, 10))
+    list_frame.pack(side='left', fill='y')
+    listbox = tk.Listbox(list_frame, width=32, exportselection=False)
+    list_scroll = ttk.Scrollbar(list_frame, orient="vertical", command=listbox.yview)
+    listbox.configure(yscrollcommand=list_scroll.set)
+    list_scroll.pack(side='right', fill='y')
+    listbox.pack(side='left', fill='y')
+    card_area = ttk.Frame(body, padding=10)
+    card_area.pack(side='left', fill='both', expand=True)
+
+    # 목록은 shape 만 표시 (dropna/미리보기는 카드를 열 때 처리)
+    candidates = [i for i, df in enumerate(app.all_tables) if len(df) >= 2]
+    listbox.insert(tk.END, *[f"📊 Table #{i+1} ({app.all_tables[i].shape[0]}행 x {app.all_tables[i].shape[1]}열)" for i in candidates])
+    cards = {}
+
+    def show(pos):
+        index = candidates[pos]
+        for card in cards.values(): card.pack_forget()
+        if index not in cards: cards[index] = _build_table_card(app, win, card_area, index)
+        cards[index].pack(fill='both', expand=True)
+
+    listbox.bind("<<ListboxSelect>>", lambda e: listbox.curselection() and show(listbox.curselection()[0]))
+    if candidates:
+        listbox.selection_set(0)
+        show(0)
     app.selection_window = win
 
 def _open_comparison_window_impl(app_instance):
@@ -572,10 +2712,195 @@ def _move_to_next_table_impl(app_instance, current_window):
     app_instance.current_table_index += 1
     app_instance.master.after(10, lambda: _open_comparison_window_impl(app_instance)) 
 
+def _report_startup(app, exit_after=False):
+    # 창이 처음 그려진 시점까지의 시간을 startup_times.jsonl 에 기록 (릴리스 간 비교용)
+    elapsed_ms = (time.perf_counter() - _PROCESS_T0) * 1000
+    record = {"time": datetime.now().isoformat(timespec="seconds"), "startup_ms": round(elapsed_ms, 1),
+              "frozen": bool(getattr(sys, "frozen", False))}
+    app.update_log(f"⏱️ 창 표시까지 {elapsed_ms:.0f}ms", "DETAIL")
+    try:
+        with open("startup_times.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError: pass
+    if exit_after:
+        print(json.dumps(record), flush=True)
+        app.on_closing()
+        return
+
+    def preload():
+        t0 = time.perf_counter()
+        _ensure_heavy_imports()
+        app.update_log(f"📦 라이브러리 로드 완료 ({(time.perf_counter() - t0) * 1000:.0f}ms)", "DETAIL")
+    threading.Thread(target=preload, daemon=True).start()
+
+# ---------------------------------------------------------------------------
+# 헤드리스 / 예약 실행 (Tk 창 없이 설정 -> 추출 -> 저장)
+# ---------------------------------------------------------------------------
+EXIT_OK = 0
+EXIT_BROWSER = 1
+EXIT_NO_TABLE = 2
+EXIT_EXPORT = 3
+EXIT_LOGIN = 4
+EXIT_CONFIG = 5
+
+class _PlainVar:
+    # tk.StringVar 대용 (get/set 만 사용)
+    def __init__(self, value=""):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+def _table_rule_index(tables, rule):
+    # table_rule: largest(기본) / index:N (1부터) / header:글자 / columns:N -> 고른 테이블의 위치 (없으면 None)
+    cleaned = [df.dropna(how='all') for df in tables]
+    candidates = [i for i, d in enumerate(cleaned) if len(d) >= 2] or list(range(len(cleaned)))
+    if not candidates: return None
+    kind, _, arg = (rule or "largest").partition(":")
+    if kind == "index":
+        n = int(arg) - 1
+        return n if 0 <= n < len(tables) else None
+    if kind == "header":
+        matched = [i for i in candidates if any(arg in str(c) for c in cleaned[i].columns)]
+        return max(matched, key=lambda i: len(cleaned[i])) if matched else None
+    if kind == "columns":
+        matched = [i for i in candidates if cleaned[i].shape[1] == int(arg)]
+        return max(matched, key=lambda i: len(cleaned[i])) if matched else None
+    return max(candidates, key=lambda i: cleaned[i].shape[0] * cleaned[i].shape[1])
+
+def _select_table_by_rule(tables, rule):
+    i = _table_rule_index(tables, rule)
+    return None if i is None else tables[i].dropna(how='all')
+
+class HeadlessRunner(WebScraperApp):
+    def __init__(self, settings_path="setting.txt"):
+        self.master = None
+        settings = self._load_settings(settings_path)
+        self._init_state(settings, _PlainVar)
+        self.headless = settings.get('headless', "1") not in ("0", "false", "False")
+        self.keep_browser = False
+
+    def update_log(self, message, level="INFO"):
+        self.file_logger.log(_LOG_LEVELS.get(level, logging.INFO), message)
+        print(f"{datetime.now().strftime('[%H:%M:%S]')} [{level}] {message}", flush=True)
+
+    def run_once(self):
+        self._begin_run()
+        code = self._run_pipeline()
+        # 저장까지 간 경우는 _export_table 에서 이미 마감됨
+        if self.recorder.active: self._finish_run(f"exit_{code}")
+        return code
+
+    def _run_pipeline(self):
+        self.update_log("--- 헤드리스 작업 시작 ---", "INFO")
+        with self.recorder.step("브라우저 준비"):
+            self.open_browser()
+        if not self.driver: return EXIT_BROWSER
+        if self.ready_xpath and not self._page_ready():
+            self.update_log("❌ 로그인 상태가 아닙니다 (ready_xpath 없음). 프로필 로그인 필요", "ERROR")
+            return EXIT_LOGIN
+        try:
+            if self.fanout_axes:
+                df = self._run_fanout()
+            elif self.stream_pages:
+                self._configure_page_settings()
+                return {"saved": EXIT_OK, "no_table": EXIT_NO_TABLE}.get(self._stream_export(), EXIT_EXPORT)
+            else:
+                self._configure_page_settings()
+                df = self._pick_table(self._collect_tables())
+        except _StepAborted:
+            return EXIT_CONFIG
+        except Exception as e:
+            self.update_log(f"❌ 탐색 오류: {e}", "ERROR")
+            return EXIT_NO_TABLE
+        if df is None or df.empty:
+            self.update_log(f"❌ 규칙({self.table_rule})에 맞는 테이블 없음", "ERROR")
+            return EXIT_NO_TABLE
+        return EXIT_OK if self._export_table(df) else EXIT_EXPORT
+
+    def watch(self):
+        # 페이지를 한 번 설정한 뒤 Ctrl+C 까지 변경분만 저장
+        self._begin_run()
+        self._watch_stop = threading.Event()
+        code = EXIT_OK
+        try:
+            with self.recorder.step("브라우저 준비"):
+                self.open_browser()
+            if not self.driver: code = EXIT_BROWSER
+            elif self.ready_xpath and not self._page_ready():
+                self.update_log("❌ 로그인 상태가 아닙니다 (ready_xpath 없음). 프로필 로그인 필요", "ERROR")
+                code = EXIT_LOGIN
+            else:
+                self._configure_page_settings()
+                code = EXIT_OK if self._watch_loop() else EXIT_NO_TABLE
+        except _StepAborted:
+            code = EXIT_CONFIG
+        except KeyboardInterrupt:
+            self._watch_stop.set()
+            self.update_log("👁 실시간 감시 종료", "WARNING")
+        finally:
+            self._finish_run(f"watch_{code}")
+        return code
+
+    def close(self):
+        if self.driver:
+            try: self.driver.quit()
+            except: pass
+            self.driver = None
+        self.export_worker.close()
+        if self._log_listener: self._log_listener.stop()
+
+def run_headless(argv):
+    parser = argparse.ArgumentParser(description="웹 테이블 추출기 헤드리스 실행")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--settings", default="setting.txt")
+    parser.add_argument("--interval", type=float, default=0, help="반복 주기(분). 0 이면 1회 실행")
+    parser.add_argument("--runs", type=int, default=0, help="반복 횟수 제한 (0 = 무제한)")
+    parser.add_argument("--history", nargs="+", metavar="DATE", help="스크래핑 없이 이력 구간(시작 [끝])을 워크북으로 재구성")
+    parser.add_argument("--history-out", default="history_view.xlsx")
+    parser.add_argument("--watch", action="store_true", help="페이지 설정 후 변경된 행만 계속 저장 (Ctrl+C 로 종료). 항상 헤드리스로 실행 (--headless 생략 가능)")
+    args = parser.parse_args(argv)
+
+    _ensure_heavy_imports()
+    runner = HeadlessRunner(args.settings)
+    if args.history:
+        rows = _HistoryStore(runner.history_dir, runner.history_center_col).to_workbook(args.history_out, args.history[0], args.history[-1])
+        runner.update_log(f"🗄️ 이력 {rows}행 -> {args.history_out}" if rows else "❌ 해당 구간 이력 없음", "SUCCESS" if rows else "ERROR")
+        return EXIT_OK if rows else EXIT_NO_TABLE
+    if args.watch:
+        try: return runner.watch()
+        finally: runner.close()
+    code = EXIT_OK
+    runs = 0
+    try:
+        while True:
+            started = time.monotonic()
+            try: code = runner.run_once()
+            except Exception as e:
+                runner.update_log(f"❌ 실행 오류: {e}", "ERROR")
+                code = EXIT_BROWSER
+            runs += 1
+            if args.interval <= 0 or (args.runs and runs >= args.runs): break
+            # 브라우저가 죽었으면 다음 회차에 open_browser 가 다시 연결/실행
+            delay = max(args.interval * 60 - (time.monotonic() - started), 0)
+            runner.update_log(f"💤 다음 실행까지 {delay:.0f}초 대기 (종료 코드 {code})", "DETAIL")
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        runner.update_log("중단됨.", "WARNING")
+    finally:
+        runner.close()
+    return code
+
 if __name__ == "__main__":
+    if {"--headless", "--history", "--watch"} & set(sys.argv[1:]):
+        sys.exit(run_headless(sys.argv[1:]))
     root = tk.Tk()
     app = WebScraperApp(root)
     WebScraperApp._open_comparison_window = _open_comparison_window_impl
     WebScraperApp._move_to_next_table = _move_to_next_table_impl
     WebScraperApp._open_full_selection_window = _open_full_selection_window_impl
+    root.after_idle(lambda: _report_startup(app, "--measure-startup" in sys.argv[1:]))
     root.mainloop()
\ No newline at end of file
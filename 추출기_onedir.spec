@@ -0,0 +1,55 @@
+# -*- mode: python ; coding: utf-8 -*-
+# 빠른 시작용 빌드: onedir (실행할 때마다 압축 해제 없음) + 안 쓰는 모듈 제외 + UPX 끔
+#   pyinstaller --noconfirm 추출기_onedir.spec
+# 시작 시간 확인: python benchmarks/bench_startup.py --exe dist/추출기/추출기.exe
+
+
+a = Analysis(
+    ['test.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[
+        # pandas/numpy 에서 쓰지 않는 부분
+        # (pandas.io.sas/stata/sql 등은 pandas import 시 바로 로드되므로 제외하면 안 됨)
+        'pandas.tests', 'pandas.io.formats.style', 'pandas.io.clipboard',
+        'numpy.tests', 'numpy.f2py', 'numpy.distutils',
+        # 설치되어 있으면 딸려 들어오는 선택 의존성
+        'matplotlib', 'scipy', 'IPython', 'jinja2', 'sqlalchemy', 'tables', 'numexpr', 'bottleneck',
+        'bs4', 'html5lib', 'pytest',
+    ],
+    noarchive=False,
+    optimize=0,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='추출기',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='추출기',
+)